@@ -0,0 +1,311 @@
+'''
+Run the examples of some files from Python, in the same process,
+and get the results of each example instead of a report.
+
+A Session loads the modules and spawns the workers once; then it can
+run files several times. Nothing is printed and the results are returned.
+
+    >>> from byexample.api import Session, run, Status
+
+    >>> with Session(['python'], options='+norm-ws') as session:
+    ...     results = session.run(['test/ds/python-tutorial.v2.md'])  # byexample: +timeout=8
+
+    >>> len(results)
+    1
+    >>> result = results[0]
+    >>> result.filepath, result.status == Status.ok
+    ('test/ds/python-tutorial.v2.md', True)
+
+    >>> [ex.status for ex in result.examples]
+    ['pass', 'pass', 'pass', 'pass']
+
+    >>> ex = result.examples[2]
+    >>> ex.start_lineno, ex.source, ex.got
+    (13, '2j * 2\n', '4j\n')
+
+A failed example comes with the differences between what was expected
+and what it got (as --diff would show them):
+
+    >>> results = run(['test/ds/python-tutorial.v1.md'], ['python'], args=['--diff', 'unified'])  # byexample: +timeout=8
+    >>> result = results[0]
+    >>> result.status == Status.failed
+    True
+
+    >>> [ex.status for ex in result.examples]
+    ['pass', 'pass', 'fail', 'fail']
+
+    >>> print(result.examples[2].diff)
+    <...>
+    -4
+    +4j
+
+A file that cannot be processed has no examples but an error:
+
+    >>> results = run(['test/ds/nonexistent.md'], ['python'])  # byexample: +timeout=8
+    >>> results[0].status == Status.error
+    True
+    >>> results[0].error
+    "[Errno 2] No such file or directory: 'test/ds/nonexistent.md'"
+'''
+import contextlib, threading, time
+from .jobs import Jobs, Status
+from .concern import Concern
+from .log import init_log_system
+
+
+class ExampleResult(object):
+    ''' The result of an example.
+
+        The status is one of 'pass', 'fail', 'skip', 'timeout', 'crash'
+        or 'abort'.
+
+        The elapsed time is in seconds (None if the example was not run),
+        <got> is the output of the example (None if it did not finish)
+        and <diff> the differences with the expected output (None unless
+        the example failed).
+        '''
+    __slots__ = (
+        'filepath', 'start_lineno', 'end_lineno', 'source', 'status',
+        'elapsed', 'got', 'diff', 'notes'
+    )
+
+    def __init__(self, example, status, elapsed, got=None, diff=None):
+        self.filepath = example.filepath
+        self.start_lineno = example.start_lineno
+        self.end_lineno = example.end_lineno
+        self.source = getattr(example, 'source', example.snippet)
+        self.status = status
+        self.elapsed = elapsed
+        self.got = got
+        self.diff = diff
+        self.notes = example.notes_on_failure
+
+    def __repr__(self):
+        return "Example %s:%i, %s" % (
+            self.filepath, self.start_lineno, self.status
+        )
+
+
+class FileResult(object):
+    ''' The result of a file: its status (see Status), how long it took
+        (in seconds), the results of its examples and the error message
+        if the file could not be processed (None otherwise).
+        '''
+    __slots__ = ('filepath', 'status', 'elapsed', 'examples', 'error')
+
+    def __init__(self, filepath, status, elapsed, examples, error=None):
+        self.filepath = filepath
+        self.status = status
+        self.elapsed = elapsed
+        self.examples = examples
+        self.error = error
+
+    def __repr__(self):
+        return "File %s, status %i, %i examples" % (
+            self.filepath, self.status, len(self.examples)
+        )
+
+
+class _ResultCollector(Concern):
+    ''' Collect the result of each example of a file. The worker
+        pops them after running it (see _execute_file). '''
+    target = 'api-results'
+
+    def __init__(self, **kargs):
+        Concern.__init__(self, **kargs)
+        self.results = []
+        self.begin = None
+
+    def start(self, examples, runners, filepath, options):
+        self.results = []
+
+    def start_example(self, example, options):
+        self.begin = time.monotonic()
+        self.flags = options
+
+    def _add(self, example, status, **kargs):
+        elapsed = None
+        if self.begin is not None:
+            elapsed = time.monotonic() - self.begin
+            self.begin = None
+
+        self.results.append(ExampleResult(example, status, elapsed, **kargs))
+
+    def skip_example(self, example, options):
+        self._add(example, 'skip')
+
+    def success(self, example, got, differ):
+        self._add(example, 'pass', got=got)
+
+    def failure(self, example, got, differ):
+        diff = differ.output_difference(
+            example, got, self.flags, use_colors=False
+        )
+        self._add(example, 'fail', got=got, diff=diff)
+
+    def timedout(self, example, exception):
+        self._add(example, 'timeout')
+
+    def crashed(self, example, exception):
+        self._add(example, 'crash')
+
+    def aborted(self, example, by_the_user, options):
+        # an example that timed out or crashed is aborted too:
+        # do not count it twice
+        if example is None or self.begin is None:
+            return
+        self._add(example, 'abort')
+
+    def cancelled(self, example, options):
+        # an example not started yet is skipped instead
+        if self.begin is None:
+            return
+        self._add(example, 'abort')
+
+    def pop_results(self):
+        results, self.results = self.results, []
+        return results
+
+
+def _execute_file(filepath, harvester, executor, dry):
+    ''' Like byexample.execute_examples but do not print anything:
+        return the FileResult too. '''
+    collector = next(
+        c for c in executor.concerns.concerns
+        if isinstance(c, _ResultCollector)
+    )
+
+    begin = time.monotonic()
+    error_msg = None
+    try:
+        examples = harvester.iter_examples_from_file(filepath)
+        if dry:
+            ret = executor.dry_execute(examples, filepath)
+        else:
+            ret = executor.execute(examples, filepath)
+    except Exception as err:
+        error_msg = str(err)
+        ret = (True, True, False, True)
+
+    failed, aborted, user_aborted, error = ret
+    status = Status.ok
+    if failed:
+        status = Status.failed
+    if aborted or user_aborted:
+        status = Status.aborted
+    if error:
+        status = Status.error
+
+    result = FileResult(
+        filepath, status,
+        time.monotonic() - begin, collector.pop_results(), error_msg
+    )
+    return ret + (result, )
+
+
+_log_system_initialized = False
+
+
+class Session(object):
+    ''' Load the modules and spawn the workers (<jobs>) to run the
+        examples written in the given <languages> with the given
+        <options> (as in --options).
+
+        Any other command line flag can be given in <args>
+        (like ['--timeout', '4']).
+
+        The session must be closed to shutdown the workers and the
+        interpreters (or use it in a with statement).
+        '''
+    def __init__(self, languages, options=None, jobs=1, args=()):
+        global _log_system_initialized
+        from .cmdline import parse_args
+        from .init import init_byexample
+
+        if not _log_system_initialized:
+            init_log_system()
+            _log_system_initialized = True
+
+        argv = ['--quiet', '--pretty', 'none', '-l', ','.join(languages)]
+        if options:
+            argv += ['--options', options]
+        argv += list(args)
+
+        args = parse_args(argv)
+        args.jobs = jobs  # there are no files yet to limit the jobs
+
+        self.stack = contextlib.ExitStack()
+        try:
+            self.jobs = Jobs(jobs, 'multithreading')
+            sharer = self.stack.enter_context(self.jobs.start_sharer())
+            _, self.cfg = init_byexample(args, sharer, files_later=True)
+
+            self.cfg['registry']['concerns']['api-results'] = \
+                    _ResultCollector(cfg=self.cfg)
+            self.cfg['options']['keep_runners_warm'] = True
+
+            self.jobs.spawn_jobs(_execute_file, [], self.cfg)
+            self.stack.callback(self._stop_workers)
+        except:
+            self.stack.close()
+            raise
+
+    def run(self, files):
+        ''' Run the <files> and return their results (see FileResult)
+            in the same order.
+
+            With --fail-fast, the files not run are not returned.
+
+            On Ctrl-C, wait for the current files to finish and raise
+            KeyboardInterrupt.
+            '''
+        files = list(files)
+        results = []
+
+        jobs = self.jobs
+        jobs.interrupt_handler = None
+        if threading.current_thread() is threading.main_thread():
+            jobs.interrupt_handler = jobs.ignore_sigint()
+
+        try:
+            rest = jobs.feed_workers(files)
+            jobs.loop(
+                len(files),
+                rest,
+                self.cfg['options']['fail_fast'],
+                keep_workers=True,
+                on_result=lambda r: results.append(r[4])
+            )
+        finally:
+            if jobs.interrupt_handler is not None:
+                jobs.restore_sigint(jobs.interrupt_handler)
+
+        if jobs.user_aborted:
+            raise KeyboardInterrupt()
+
+        order = {f: i for i, f in reversed(list(enumerate(files)))}
+        results.sort(key=lambda r: order[r.filepath])
+        return results
+
+    def _stop_workers(self):
+        self.jobs.stop_workers()
+        self.jobs.join_jobs()
+
+    def close(self):
+        self.stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def run(files, languages, options=None, jobs=1, args=()):
+    ''' Run the <files> in a new Session and return their results.
+
+        To run files several times, use a Session instead so the
+        modules and the interpreters are not loaded each time.
+        '''
+    with Session(languages, options, jobs, args) as session:
+        return session.run(files)
@@ -8,15 +8,12 @@ if sys.version_info < (3, 0):
     )
     sys.exit(1)
 
-from .jobs import Jobs, Status
-from .log import init_log_system, shutdown_log_system
-
 
 def execute_examples(filename, harvester, executor, dry):
     from .common import human_exceptions
 
     with human_exceptions("processing the file '%s'" % filename) as exc:
-        examples = harvester.get_examples_from_file(filename)
+        examples = harvester.iter_examples_from_file(filename)
         if dry:
             return executor.dry_execute(examples, filename)
         else:
@@ -28,6 +25,15 @@ def execute_examples(filename, harvester, executor, dry):
 
 
 def main(args=None):
+    # the client must be fast: do not load the rest of byexample
+    argv = sys.argv[1:] if args is None else args
+    if argv[:1] == ['--client']:
+        from .daemon import client_main
+        return client_main(argv[1:])
+
+    from .jobs import Jobs, Status
+    from .log import init_log_system, shutdown_log_system
+
     init_log_system()
 
     from .cmdline import parse_args
@@ -36,17 +42,48 @@ def main(args=None):
 
     args = parse_args(args)
 
-    jobs = Jobs(args.jobs, 'multithreading')
-    with jobs.start_sharer() as sharer:
-        with human_exceptions('initializing byexample') as exc:
-            testfiles, cfg = init_byexample(args, sharer)
+    while True:
+        jobs = Jobs(args.jobs, 'multithreading')
+        with jobs.start_sharer() as sharer:
+            with human_exceptions('initializing byexample') as exc:
+                testfiles, cfg = init_byexample(
+                    args, sharer, files_later=args.daemon is not None
+                )
+
+            if exc:
+                sys.exit(Status.error)
+
+            watcher = None
+            if args.watch:
+                from .watch import FileWatcher
+                watcher = FileWatcher(testfiles, args.modules_dirs)
+
+            server = None
+            if args.daemon is not None:
+                from .daemon import DaemonServer
+                with human_exceptions('starting the daemon') as exc:
+                    server = DaemonServer(args.daemon, cfg['output'])
+
+                if exc:
+                    sys.exit(Status.error)
 
-        if exc:
-            sys.exit(Status.error)
+            try:
+                ret = jobs.run(
+                    execute_examples,
+                    testfiles,
+                    cfg['options']['fail_fast'],
+                    cfg,
+                    watcher=watcher,
+                    server=server
+                )
+            finally:
+                if server is not None:
+                    server.close()
 
-        ret = jobs.run(
-            execute_examples, testfiles, cfg['options']['fail_fast'], cfg
-        )
+        # in watch mode, a change in the modules requires to load them
+        # and initialize everything again
+        if not (watcher and watcher.modules_changed):
+            break
 
     shutdown_log_system()
     return ret
@@ -3,7 +3,7 @@ import sys, argparse, os, multiprocessing, glob, itertools, codecs, signal
 import bracex
 import argcomplete
 import textwrap
-from argcomplete.completers import EnvironCompleter, DirectoriesCompleter
+from argcomplete.completers import EnvironCompleter, DirectoriesCompleter, FilesCompleter
 import importlib_resources as impres
 
 from . import __version__, __doc__, _author, _license, _url, _license_disclaimer
@@ -544,6 +544,42 @@ def parse_args(args=None):
                  '"cpu<n>" multiply it by <n> the cpus available.'
     ).completer = HintMessageNonCompleter("Use 'cpu', 'cpu<n>' or <n> (a positive number).")
 
+    g.add_argument(
+        "--history",
+        metavar='<dir>',
+        default=None,
+        help='record how long each example took in the <dir> directory ' + \
+             '(disabled by default).'
+    ).completer = DirectoriesCompleter()
+    g.add_argument(
+        "--adaptive-timeout",
+        action='store_true',
+        help='lower the timeout of each example based on how long ' + \
+             'it took before (see --history); the timeout set for ' + \
+             'the example is never exceeded.'
+    )
+    g.add_argument(
+        "--watch",
+        action='store_true',
+        help='run the files and then run them again each time that ' + \
+             'they change; a change in the modules loads them again.'
+    )
+    g.add_argument(
+        "--daemon",
+        metavar='<socket>',
+        default=None,
+        help='do not run any file but keep the interpreters ready and ' + \
+             'run the files that the clients send through the <socket> ' + \
+             '(see --client).'
+    ).completer = FilesCompleter()
+    g.add_argument(
+        "--client",
+        metavar='<socket>',
+        default=None,
+        help='send the files to the daemon listening in <socket> and ' + \
+             'print the results; it must be the first argument and ' + \
+             'the rest of the options are the ones of the daemon.'
+    ).completer = FilesCompleter()
     g.add_argument(
         "--dry",
         action='store_true',
@@ -743,6 +779,14 @@ def parse_args(args=None):
         help=
         "delay in seconds after the prompt to capture more output; 0 disable this (default)."
     ).completer = HintMessageNonCompleter("Delay in seconds")
+    g.add_argument(
+        "-x-read-size",
+        metavar="<chars>",
+        default=8192,
+        type=int,
+        help=
+        "read up to <chars> from a runner/interpreter at once; its prompts are searched in the last 2*<chars> read (default: %(default)s)."
+    ).completer = HintMessageNonCompleter(None)
     g.add_argument(
         "-x-turn-echo-off",
         action='store',
@@ -767,6 +811,14 @@ def parse_args(args=None):
         help=
         "minimum match length around a capture tag to perform a guess (default: %(default)s)."
     ).completer = HintMessageNonCompleter(None)
+    g.add_argument(
+        "-x-stream-window",
+        metavar="<chars>",
+        default=0,
+        type=int,
+        help=
+        "read the files larger than <chars> window by window instead of reading them at once; 0 disable this (default)."
+    ).completer = HintMessageNonCompleter(None)
     g.add_argument(
         "-x-not-recover-timeout",
         action='store_true',
@@ -886,6 +938,24 @@ def parse_args(args=None):
             )
         copy.remove(k)
 
+    if namespace.adaptive_timeout and not namespace.history:
+        parser.error("argument --adaptive-timeout: it requires --history.")
+
+    if namespace.client is not None:
+        # the client is handled before parsing the arguments (see main)
+        parser.error("argument --client: it must be the first argument.")
+
+    if namespace.daemon is not None:
+        if namespace.files:
+            parser.error(
+                "argument --daemon: the files are sent by the clients, not given here."
+            )
+        if namespace.watch:
+            parser.error("argument --daemon: not allowed with --watch.")
+
+        # the files are not known yet
+        return namespace
+
     # Do not spawn more jobs than testfiles
     namespace.jobs = min(namespace.jobs, len(namespace.testfiles))
     return namespace
@@ -39,6 +39,7 @@ class Concern(Extension, ExtendOptionParserMixin):
 
          - finally_example
          - aborted
+         - cancelled
 
          - start_interact
          - finish_interact
@@ -79,6 +80,11 @@ class Concern(Extension, ExtendOptionParserMixin):
         Keep in mind that we are talking about examples that are not fully
         parsed yet so you may not get all their attributs.
 
+        If the examples are streamed (see -x-stream-window), both lists,
+        the examples and the runners, are empty at the begin and they
+        grow as the examples are found and executed. The runners are
+        initialized on demand, just before executing their first example.
+
         If you want to customize the example *after* the parsing stage
         use start_example.
         '''
@@ -226,6 +232,19 @@ class Concern(Extension, ExtendOptionParserMixin):
         '''
         pass  # pragma: no cover
 
+    def cancelled(self, example, options):
+        '''
+        The run execution was cancelled because another job failed
+        in fail fast mode (--ff).
+
+        The given example was interrupted or, if it was not started
+        yet, it is skipped (see skip_example) like the rest.
+
+        The run is not considered failed because of this: the
+        failure is of the other job.
+        '''
+        pass  # pragma: no cover
+
     def crashed(self, example, exception):
         '''
         The given example crashed. More formally, the example's runner
@@ -263,21 +282,74 @@ class Concern(Extension, ExtendOptionParserMixin):
 
 
 class ConcernComposite(Concern):
+    r'''
+    Dispatch each hook to all the registered concerns.
+
+    For each hook, only the concerns that override it are called
+    (the methods of Concern do nothing). These are resolved once, when
+    the ConcernComposite is created.
+
+        >>> from byexample.cfg import Config
+        >>> from byexample.concern import Concern, ConcernComposite
+
+        >>> class Greeter(Concern):
+        ...     target = 'greeter'
+        ...     def start_example(self, example, options):
+        ...         print("Hello", example)
+
+        >>> class Counter(Concern):
+        ...     target = 'counter'
+        ...     def start_example(self, example, options):
+        ...         print("Count", example)
+        ...     def success(self, example, got, differ):
+        ...         print("Success", example)
+
+        >>> greeter, counter = Greeter(cfg=None), Counter(cfg=None)
+        >>> concerns = ConcernComposite(
+        ...     Config(registry={'concerns': {'greeter': greeter, 'counter': counter}})
+        ...     )
+
+        >>> concerns.hooks_of('start_example')
+        (Greeter Concern, Counter Concern)
+        >>> concerns.hooks_of('success')
+        (Counter Concern,)
+        >>> concerns.hooks_of('failure')
+        ()
+
+        >>> concerns.start_example('ex1', None)
+        Hello ex1
+        Count ex1
+        >>> concerns.failure('ex1', None, None)  # nobody is called
+    '''
     def __init__(self, cfg):
         Concern.__init__(self, cfg=cfg)
-        self.concerns = cfg.registry['concerns'].values()
+        self.concerns = list(cfg.registry['concerns'].values())
+
+        # for each hook, the concerns' methods that override it
+        self._hooks = {}
+        for method_name in _hook_names:
+            dfl = getattr(Concern, method_name)
+            self._hooks[method_name] = tuple(
+                getattr(concern, method_name) for concern in self.concerns
+                if getattr(type(concern), method_name, dfl) is not dfl
+            )
+
+    def hooks_of(self, method_name):
+        ''' Return the concerns that will be called for
+            the <method_name> hook. '''
+        return tuple(m.__self__ for m in self._hooks[method_name])
 
 
 # Patch ConcernComposite overriding all its methods
 # For a given method X, ConcernComposite will call X on all of
-# its sub-concerns.
+# its sub-concerns that override X.
 import inspect
 
 
 def _patch(cls, method_name):
     def for_each_concern_do(self, *args, **kargs):
-        for concern in self.concerns:
-            getattr(concern, method_name)(*args, **kargs)
+        for hook in self._hooks[method_name]:
+            hook(*args, **kargs)
 
     setattr(cls, method_name, for_each_concern_do)
 
@@ -289,5 +361,10 @@ def _patchable(obj):
             and not obj.__name__.startswith("_")
 
 
-for method_name, _ in inspect.getmembers(Concern, predicate=_patchable):
+_hook_names = [
+    method_name
+    for method_name, _ in inspect.getmembers(Concern, predicate=_patchable)
+]
+
+for method_name in _hook_names:
     _patch(ConcernComposite, method_name)
@@ -3,6 +3,7 @@ def load_concurrency_engine(concurrency_model):
         from multiprocessing.dummy import Process
         from multiprocessing.dummy import Manager as _Threading_Manager
         from multiprocessing.dummy import Queue
+        from multiprocessing.dummy import Event
 
         # multiprocessing.dummy.Manager is not a context manager so
         # it cannot be used exactly like a multiprocessing.Manager
@@ -14,16 +15,17 @@ def load_concurrency_engine(concurrency_model):
             def __exit__(self, *args):
                 pass
 
-        return (Process, Manager, Queue)
+        return (Process, Manager, Queue, Event)
 
     elif concurrency_model == 'multiprocessing':
         from multiprocessing import Process
         from multiprocessing import Manager
         from multiprocessing import Queue
+        from multiprocessing import Event
         from multiprocessing import set_start_method
 
         set_start_method('fork')  # or 'spawn' or 'forkserver'
-        return (Process, Manager, Queue)
+        return (Process, Manager, Queue, Event)
 
     else:
         raise ValueError(
@@ -0,0 +1,192 @@
+''' Run byexample as a daemon that receives the files to run from
+clients through a Unix domain socket (see --daemon and --client).
+
+The protocol is made of lines of JSON objects.
+
+The client sends a single request:
+
+ - {"cwd": <working directory>, "files": [<file>, ...]}
+
+The daemon replies with the output of the run, in several pieces,
+and the exit status at the end:
+
+ - {"out": <text>}
+ - {"exit": <status>}
+
+This module is imported by the client so it must be cheap to import:
+do not import the rest of byexample here.
+'''
+import json, os, socket, sys, threading
+
+
+class DaemonOutput(object):
+    ''' The output of the daemon: while a request is being served,
+        everything written goes to its client; otherwise to <fallback>
+        (the stdout of the daemon).
+        '''
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.client = None
+        self.lock = threading.RLock()
+
+    def write(self, text):
+        with self.lock:
+            if self.client is None:
+                return self.fallback.write(text)
+
+            try:
+                _send(self.client, {'out': text})
+            except OSError:
+                # the client went away (probably the user pressed Ctrl-C)
+                # the run continues but nobody will see its output
+                self.client = None
+
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            if self.client is None:
+                self.fallback.flush()
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        return self.fallback.fileno()
+
+    def serve(self, client):
+        with self.lock:
+            self.client = client
+
+    def release(self):
+        with self.lock:
+            client, self.client = self.client, None
+        return client
+
+
+class DaemonServer(object):
+    ''' Listen for the requests of the clients in the Unix domain
+        socket <path>. The requests are served one at a time.
+        '''
+    def __init__(self, path, output):
+        self.path = path
+        self.output = output
+
+        if _is_listening(path):
+            raise Exception(
+                "There is another daemon listening in '%s' already." % path
+            )
+
+        if os.path.exists(path):
+            os.unlink(path)  # a stale socket
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen()
+
+    def close(self):
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def next_request(self):
+        ''' Block until a client sends a valid request and return
+            the files to run.
+
+            The output is redirected to the client until finish_request
+            is called.
+            '''
+        while True:
+            client, _ = self.sock.accept()
+            try:
+                client.settimeout(5)
+                with client.makefile('rb') as f:
+                    request = json.loads(f.readline().decode('utf-8'))
+
+                cwd, files = request['cwd'], request['files']
+                client.settimeout(None)
+            except (OSError, ValueError, KeyError, TypeError):
+                client.close()
+                continue  # not a client of us or it went away
+
+            # the files' paths and the examples are relative to the
+            # working directory of the client so it must be ours
+            if cwd != os.getcwd():
+                self.output.serve(client)
+                self.output.write(
+                    "The daemon runs in '%s' but the client in '%s'.\n" %
+                    (os.getcwd(), cwd)
+                )
+                self.finish_request(status=3)  # Status.error
+                continue
+
+            if not files:
+                self.output.serve(client)
+                self.finish_request(status=0)
+                continue
+
+            self.output.serve(client)
+            return files
+
+    def finish_request(self, status):
+        client = self.output.release()
+        if client is None:
+            return
+
+        try:
+            _send(client, {'exit': status})
+        except OSError:
+            pass
+        finally:
+            client.close()
+
+
+def run_client(path, files):
+    ''' Send the <files> to the daemon listening in <path>, print the output
+        of the run and return its exit status.
+        '''
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError as err:
+        print("Could not connect to the daemon at '%s': %s" % (path, err))
+        return 3  # Status.error
+
+    with sock:
+        _send(sock, {'cwd': os.getcwd(), 'files': files})
+        with sock.makefile('rb') as f:
+            for line in f:
+                reply = json.loads(line.decode('utf-8'))
+                if 'exit' in reply:
+                    return reply['exit']
+
+                sys.stdout.write(reply['out'])
+                sys.stdout.flush()
+
+    print("The daemon at '%s' closed the connection unexpectedly." % path)
+    return 3  # Status.error
+
+
+def client_main(argv):
+    ''' Entry point of 'byexample --client <socket> <files>'. '''
+    if len(argv) < 1:
+        print("usage: byexample --client <socket> [<file> ...]")
+        return 3  # Status.error
+
+    return run_client(argv[0], argv[1:])
+
+
+def _send(sock, msg):
+    sock.sendall(json.dumps(msg).encode('utf-8') + b'\n')
+
+
+def _is_listening(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.connect(path)
+            return True
+        except OSError:
+            return False
@@ -10,6 +10,8 @@ import pprint
 
 
 class Where(object):
+    __slots__ = ('start_lineno', 'end_lineno', 'filepath', 'zdelimiter')
+
     def __init__(self, start_lineno, end_lineno, filepath, zdelimiter):
         self.start_lineno = start_lineno
         self.end_lineno = end_lineno
@@ -29,11 +31,47 @@ class Where(object):
 
 
 class Zone(object):
-    def __init__(self, zdelimiter, zone_str, where):
+    r'''
+    A piece of text where examples can be found.
+
+    The zone may be the whole <zone_str> or only a window of it,
+    zone_str[pos:endpos], so the zone can refer to the original string
+    without copying it.
+
+    >>> from byexample.example import Zone
+    >>> zone = Zone(None, 'foo\nbar\nbaz', None, pos=4, endpos=7)
+    >>> zone.str
+    'bar'
+
+    >>> zone = Zone(None, 'foo\nbar\nbaz', None)
+    >>> zone.str
+    'foo\nbar\nbaz'
+    '''
+    __slots__ = (
+        'zdelimiter', 'string', 'pos', 'endpos', 'line_index', 'where'
+    )
+
+    def __init__(
+        self,
+        zdelimiter,
+        zone_str,
+        where,
+        pos=0,
+        endpos=None,
+        line_index=None
+    ):
         self.zdelimiter = zdelimiter
-        self.str = zone_str
+        self.string = zone_str
+        self.pos, self.endpos = pos, endpos
+        self.line_index = line_index
         self.where = where
 
+    @property
+    def str(self):
+        if self.pos == 0 and self.endpos is None:
+            return self.string
+        return self.string[self.pos:self.endpos]
+
 
 class Example(object):
     r'''
@@ -102,7 +140,40 @@ class Example(object):
     <...>
     AttributeError: 'Example' object has no attribute 'current_options'
 
+    There may be thousands of examples in memory so the attributes
+    set by byexample are slots. Other attributes can be set too
+    (by a concern for example) but they are stored in a dictionary.
+
     '''
+    __slots__ = (
+        # set on the creation of the example
+        'finder',
+        'runner',
+        'parser',
+        'snippet',
+        'expected_str',
+        'indentation',
+        'start_lineno',
+        'end_lineno',
+        'filepath',
+        'zdelimiter',
+        'fully_parsed',
+        'notes_on_failure',
+
+        # set by the parser (parse_yourself)
+        'source',
+        'expected',
+        'options',
+        'input_list',
+
+        # set by the executor during the execution
+        'got',
+        'current_options',
+
+        # anything else
+        '__dict__',
+    )
+
     def __init__(
         self, finder, runner, parser, snippet, expected_str, indent, where
     ):
@@ -112,10 +183,10 @@ class Example(object):
         self.start_lineno, self.end_lineno, self.filepath, self.zdelimiter = where
 
         self.fully_parsed = False
-        self.notes_on_failure = []
+        self.notes_on_failure = ()  # most of the examples will not have any
 
     def add_note_on_failure(self, msg):
-        self.notes_on_failure.append(msg)
+        self.notes_on_failure += (msg, )
 
     def parse_yourself(self, concerns=None):
         if self.fully_parsed:
@@ -2,7 +2,7 @@ from __future__ import unicode_literals
 from .common import enhance_exceptions
 from .log import clog, log_context, log_with
 from .prof import profile, profile_ctx
-import contextlib
+import contextlib, os
 
 
 class TimeoutException(Exception):
@@ -36,6 +36,12 @@ class InterpreterNotFound(Exception):
         self.runner_cmd = runner_cmd
 
 
+class ExecutionCancelled(Exception):
+    ''' Raised by a runner when the execution of an example was
+        interrupted because another job failed (see FileExecutor). '''
+    pass
+
+
 r'''
 >>> from byexample.runner import ExampleRunner
 >>> from byexample.executor import FileExecutor
@@ -137,12 +143,47 @@ Exception: Faked on shutdown of buggy2
 
 Note: no tests nor documentation about 'reset' is done yet.
 
+>>> fexec.close()   # byexample: -skip
+
+When the examples are streamed the runners are initialized on demand,
+after the concerns were started. If an initialization fails, the
+concerns are finished anyways as if the execution crashed:
+
+>>> from byexample.finder import _build_fake_example
+
+>>> class Concerns:
+...     def start(self, examples, runners, filepath, options):
+...         print("start()")
+...     def finish(self, failed, user_aborted, crashed, broken, timedout):
+...         print("finish()", failed, user_aborted, crashed)
+
+>>> example = _build_fake_example('1', '1', language='buggy1', fully_parsed=False)
+>>> example.runner = Buggy("buggy1", "initialize")
+
+>>> fexec = FileExecutor(Concerns(), None, _dummy_cfg(["buggy1"]))
+>>> fexec.execute(iter([example]), 'foo.md')
+start()
+initialize() buggy1
+[w] Initialization of Buggy1 Runner failed.
+finish() True False True
+Traceback (most recent call last):
+<...>
+Exception: Faked on initialize of buggy1
+
 >>> fexec.close()   # byexample: -skip
 '''
 
 
 class FileExecutor(object):
-    def __init__(self, concerns, differ, cfg):
+    ''' Execute the examples of a file.
+
+        The <cancellation> event is shared by all the jobs: with
+        --fail-fast, when a job fails it is set and the files executed
+        by the other jobs are cancelled too.
+        The rest of their examples are skipped and the runners that are
+        blocked running an example are interrupted (see ExampleRunner.cancellation).
+        '''
+    def __init__(self, concerns, differ, cfg, cancellation=None):
         self.concerns = concerns
         self.differ = differ
         self.use_colors = cfg.use_colors
@@ -151,6 +192,15 @@ class FileExecutor(object):
         self.options = cfg.options
         self.still_alive_runners = set()
 
+        # initialize again the runners after running a file so they
+        # are ready for the next one (see warm_up_runners)
+        self.keep_runners_warm = self.options.get('keep_runners_warm', False)
+        self.runners_to_warm = []
+
+        if not self.options.get('fail_fast', False):
+            cancellation = None
+        self.cancellation = cancellation
+
     @contextlib.contextmanager
     def on_failure_shutdown_runners(
         self, should_raise, runners_left, log, err_args
@@ -199,6 +249,7 @@ class FileExecutor(object):
             with self.with_lang_specific_defaults(runner), log_with(
                 runner.language
             ) as log:
+                runner.cancellation = self.cancellation
                 if runner in self.still_alive_runners:
                     log.info("Reusing %s", str(runner))
                     so_far.append(runner)
@@ -281,7 +332,8 @@ class FileExecutor(object):
 
     @log_context('byexample.exec')
     def dry_execute(self, examples, filepath):
-        clog().info('File %s, %i examples.', filepath, len(examples))
+        if isinstance(examples, list):
+            clog().info('File %s, %i examples.', filepath, len(examples))
         for example in examples:
             with enhance_exceptions(example, example.parser, self.use_colors), \
                 self.with_lang_specific_defaults(example), \
@@ -293,26 +345,112 @@ class FileExecutor(object):
 
     @log_context('byexample.exec')
     def execute(self, examples, filepath):
-        runners = list(set(e.runner for e in examples))
-
-        self.initialize_runners(runners)
+        if isinstance(examples, list):
+            # all the examples are known: initialize their runners upfront
+            runners = list(set(e.runner for e in examples))
+            self.initialize_runners(runners)
+            to_exec = examples
+        else:
+            # the examples are streamed (see iter_examples_from_file):
+            # the concerns will see the lists of examples and runners
+            # growing as the examples are found and their runners
+            # initialized on demand
+            stream, examples, runners = examples, [], []
+            to_exec = self._iter_streamed(stream, examples, runners)
+
+        deferred = False
         try:
             self.concerns.start(examples, runners, filepath, self.options)
-            failed, user_aborted, crashed, broken, timedout = self._exec(
-                examples, filepath, runners
-            )
+            try:
+                failed, user_aborted, crashed, broken, timedout, cancelled = self._exec(
+                    to_exec, filepath, runners
+                )
+            except BaseException as err:
+                # a runner failed to initialize while the examples
+                # were streamed (or the user aborted it): the concerns
+                # were started so finish them
+                user_aborted = isinstance(err, KeyboardInterrupt)
+                self.concerns.finish(
+                    True, user_aborted, not user_aborted, False, False
+                )
+                raise
+
             self.concerns.finish(
                 failed, user_aborted, crashed, broken, timedout
             )
+
+            # the reset (shutdown) of the runners is deferred
+            # to warm_up_runners so it does not delay the results
+            deferred = self.keep_runners_warm and not user_aborted
+        finally:
+            if not deferred:
+                self.reset_runners(runners)
+
+        if deferred:
+            self.runners_to_warm.extend(
+                r for r in runners if r not in self.runners_to_warm
+            )
+
+        # a cancelled file is aborted but it did not fail: the file
+        # that failed (and triggered the cancellation) is to blame
+        aborted = crashed or broken or timedout or cancelled
+        return failed, aborted, user_aborted, False
+
+    def warm_up_runners(self, runners=None):
+        ''' Initialize the <runners> ahead of time. The next file
+            that uses them will reuse them (see initialize_runners).
+
+            By default, reset and initialize again the runners used by
+            the last files executed (if keep_runners_warm is set, execute
+            does not reset them). The worker calls this after sending the
+            results of a file so the reset and the initialization do not
+            delay them.
+
+            This is best effort: on a failure, the runners will be
+            initialized again when they are needed.
+            '''
+        if runners is None:
+            runners, self.runners_to_warm = self.runners_to_warm, []
+            self.reset_runners(runners, should_raise=False)
+
+        if not runners:
+            return
+
+        try:
+            self.initialize_runners(runners)
+        except Exception:
+            pass  # initialize_runners already logged the failure
+
+    def _cancel_runner(self, example, options):
+        ''' Cancel the example's runner (see ExampleRunner.cancel).
+
+            The runner must not be cancelled while it recovers the
+            control of its interpreter so it does not see the
+            cancellation meanwhile, even if another job failed.
+            '''
+        runner = example.runner
+        runner.cancellation = None
+        try:
+            return runner.cancel(example, options)
         finally:
-            self.reset_runners(runners)
+            runner.cancellation = self.cancellation
+
+    def _iter_streamed(self, stream, examples, runners):
+        for example in stream:
+            examples.append(example)
+
+            runner = example.runner
+            if runner not in runners:
+                self.initialize_runners([runner])
+                runners.append(runner)
 
-        return failed, (crashed or broken or timedout), user_aborted, False
+            yield example
 
     @profile
     def _exec(self, examples, filepath, runners):
         options = self.options
         failing_fast = False
+        cancelled = False
         failed = False
         user_aborted = False
         crashed = False
@@ -342,12 +480,27 @@ class FileExecutor(object):
                     # mode
                     options.up(example.options)
                     example.current_options = options
+                    spill_noted = False
                     try:
                         # ask to the example if we should fail fast if it fails
                         # no matter what the user said from the command line
                         fail_fast = options['fail_fast']
 
-                        if options['skip']:
+                        # another job failed: skip the rest of the examples
+                        # like if this one had failed, even the ones that
+                        # wanted to run in failing fast mode
+                        if not cancelled and self.cancellation is not None \
+                                and self.cancellation.is_set():
+                            clog().chat(
+                                'another job failed, cancelling the execution'
+                            )
+                            cancelled = True
+                            self.concerns.cancelled(example, options)
+                            if not failing_fast:
+                                failing_fast = True
+                                options.up({'skip': True})
+
+                        if options['skip'] or cancelled:
                             clog().chat('skip example', example=example)
                             self.concerns.skip_example(example, options)
                             continue
@@ -363,15 +516,28 @@ class FileExecutor(object):
                                     example, options
                                 )
                             self.concerns.finish_example(example, options)
+                        except ExecutionCancelled:
+                            cancelled = True
                         except TimeoutException as e:  # pragma: no cover
                             self.concerns.timedout(example, e)
-                            timedout = True
+                            timedout = spill_noted = True
                         except Exception as e:  # pragma: no cover
                             self.concerns.crashed(example, e)
                             crashed = True
                         finally:
                             self.concerns.finally_example(example, options)
 
+                        if cancelled:
+                            # the runner was interrupted in the middle of
+                            # the example: recover its control so it can be
+                            # reset cleanly
+                            clog().chat(
+                                'another job failed, the example was interrupted'
+                            )
+                            self._cancel_runner(example, options)
+                            self.concerns.cancelled(example, options)
+                            break
+
                         recovered = False
                         if timedout and not options['x']['not_recover_timeout']:
                             # try to recover the control of the runner
@@ -379,7 +545,7 @@ class FileExecutor(object):
                                 'Example timed out. Trying to recovering the control (%s)...',
                                 example.runner.language
                             )
-                            recovered = example.runner.cancel(example, options)
+                            recovered = self._cancel_runner(example, options)
                             clog().warn('Recovering control of %s %s',
                                     example.runner.language,
                                     'succeeded, continuing the execution.' if recovered else \
@@ -403,9 +569,13 @@ class FileExecutor(object):
                                 clog2.debug("\n" + got)
 
                             # We can pass the test regardless of the output
+                            # but if the output was too large (truncated,
+                            # see +max-output) the example fails without
+                            # checking it
                             force_pass = options['pass']
-                            if force_pass or \
-                                    example.expected.check_got_output(example, got, options, self.verbosity):
+                            exceeded = getattr(example, 'output_spill', None)
+                            if force_pass or (not exceeded and \
+                                    example.expected.check_got_output(example, got, options, self.verbosity)):
                                 self.concerns.success(
                                     example, got, self.differ
                                 )
@@ -413,7 +583,7 @@ class FileExecutor(object):
                                 self.concerns.failure(
                                     example, got, self.differ
                                 )
-                                failed = True
+                                failed = spill_noted = True
 
                                 # start an interactive session if the example fails
                                 # and the user wanted this
@@ -447,13 +617,26 @@ class FileExecutor(object):
                         if hasattr(example, 'got'):
                             del example.got
                         del example.current_options
+
+                        # the output beyond +max-output is kept only if
+                        # a failure note points to it
+                        # (it may be gone already, like by a tmp cleaner)
+                        spill = getattr(example, 'output_spill', None)
+                        if spill and not spill_noted:
+                            with contextlib.suppress(OSError):
+                                os.remove(spill)
+
+                        # the same for the expected regexs and the input
+                        # list: they are the heaviest parts of an example
+                        # and they are not needed after its execution
+                        del example.expected, example.input_list
                         options.down()
             except KeyboardInterrupt:  # pragma: no cover
                 self.concerns.aborted(example, True, options)
                 failed = user_aborted = True
                 break
 
-        return failed, user_aborted, crashed, broken, timedout
+        return failed, user_aborted, crashed, broken, timedout, cancelled
 
     @profile
     def _parse(self, example):
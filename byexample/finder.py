@@ -1,5 +1,5 @@
 from __future__ import unicode_literals
-import os
+import os, io, sys, mmap, codecs, array, bisect, functools, itertools
 from . import regex as re
 from .common import build_where_msg, tohuman, \
                     enhance_exceptions
@@ -125,26 +125,267 @@ class ExampleHarvest(object):
             try:
                 string = f.read()
             except UnicodeDecodeError as err:
-                msg1 = "Reading the file '%s' using the '%s' encoding failed due decoding errors." % (
-                    filepath, self.encoding
-                )
+                self._abort_on_decoding_error(filepath)
 
-                msg2 = msg1 + '\nTry a different encoding with \'--encoding\' from the command line.\n'
+        return self.get_examples_from_string(string, filepath)
 
-                clog().exception(msg2)
-                raise SystemExit(msg1)
+    def _abort_on_decoding_error(self, filepath):
+        msg1 = "Reading the file '%s' using the '%s' encoding failed due decoding errors." % (
+            filepath, self.encoding
+        )
 
-        return self.get_examples_from_string(string, filepath)
+        msg2 = msg1 + '\nTry a different encoding with \'--encoding\' from the command line.\n'
 
-    @log_context('byexample.zones')
-    def _get_zones(self, string, filepath='<string>'):
+        clog().exception(msg2)
+        raise SystemExit(msg1)
+
+    def iter_examples_from_file(self, filepath):
+        r'''
+        Return the examples found in the file.
+
+        If the file is larger than the stream window (-x-stream-window),
+        the file is read and searched window by window and the examples
+        are yielded as they are found so the whole file is never loaded
+        in memory (see _stream_examples_from_file).
+
+        Otherwise, this is the same as get_examples_from_file and
+        a list is returned.
+        '''
+        zdelimiter = self._get_zdelimiter(filepath)
+        window = self.options['x']['stream_window']
+
+        # Only the delimiters that can tell where a zone begins can be
+        # streamed. Files without a zone delimiter have a single zone (the
+        # whole file) and the docstrings' delimiter needs to parse the
+        # whole source so neither can.
+        can_stream = zdelimiter.zone_begin_regex() is not None
+
+        if window and can_stream and os.path.getsize(filepath) > window:
+            return self._stream_examples_from_file(
+                filepath, zdelimiter, window
+            )
+
+        return self.get_examples_from_file(filepath)
+
+    def _stream_examples_from_file(self, filepath, zdelimiter, window):
+        r'''
+        Find and yield the examples of the file reading it window by window.
+
+        The file is memory-mapped and decoded incrementally in pieces of
+        <window> characters, keeping in memory at least two of them.
+
+        A zone is taken if it begins in the first window of the buffer;
+        the second window is a look ahead.
+
+        If a zone begins in the first window (see
+        ZoneDelimiter.zone_begin_regex) but it does not end in the buffer,
+        or it reaches the end of the buffer and it may be truncated,
+        the buffer grows until the zone ends (or the file ends) and the zone
+        is searched again.
+
+        Then, the text consumed by the zones (or the first window if no
+        zone was found) is discarded and more text is read.
+
+        So the memory used is bounded by the largest zone and not by
+        the size of the file.
+
+            >>> import tempfile
+            >>> from byexample.finder import ExampleHarvest
+            >>> from byexample.modules.delimiters import MarkdownFencedCodeDelimiter
+            >>> from byexample.modules.python import PythonPromptFinder, PythonParser
+
+            >>> cfg = _dummy_cfg()
+            >>> cfg.registry['zdelimiters']['.md'] = MarkdownFencedCodeDelimiter(cfg=cfg)
+            >>> cfg.registry['zdelimiters']['no-delimiter'] = None
+            >>> cfg.registry['finders']['python-prompt'] = PythonPromptFinder(cfg=cfg)
+            >>> cfg.registry['parsers']['python'] = PythonParser(cfg=cfg)
+            >>> class FakeRunner:
+            ...     language = 'python'
+            >>> cfg.registry['runners']['python'] = FakeRunner()
+            >>> cfg.options['x'] = {'stream_window': 64}
+            >>> f = ExampleHarvest(cfg)
+
+            >>> text = ''.join('```python\n>>> %i\n%i\n```\n\nblah blah\n\n' % (i, i)
+            ...                for i in range(100))
+
+            >>> with tempfile.NamedTemporaryFile('wt', suffix='.md') as tmp:
+            ...     _ = tmp.write(text); tmp.flush()
+            ...     examples = f.iter_examples_from_file(tmp.name)
+            ...     streamed = [(e.start_lineno, e.end_lineno, e.snippet) for e in examples]
+            ...     examples = f.get_examples_from_file(tmp.name)
+            ...     read_once = [(e.start_lineno, e.end_lineno, e.snippet) for e in examples]
+
+            >>> streamed == read_once
+            True
+            >>> len(streamed), streamed[42]
+            (100, (296, 297, '42'))
+
+        A zone larger than the window is not missed and neither are
+        the zones after it:
+
+            >>> big = '```python\n' + ''.join('>>> %i\n%i\n' % (i, i) for i in range(50)) + '```\n'
+            >>> text = 'blah\n\n' + big + '\n```python\n>>> 99\n99\n```\n'
+            >>> len(big) > 4 * 64
+            True
+
+            >>> with tempfile.NamedTemporaryFile('wt', suffix='.md') as tmp:
+            ...     _ = tmp.write(text); tmp.flush()
+            ...     streamed = [e.snippet for e in f.iter_examples_from_file(tmp.name)]
+
+            >>> len(streamed), streamed[:2], streamed[-2:]
+            (51, ['0', '1'], ['49', '99'])
+        '''
+        filepath = sys.intern(filepath)
+        examples = self._iter_windows_examples(filepath, zdelimiter, window)
+        return self._iter_without_overlap(
+            itertools.chain.from_iterable(examples), filepath
+        )
+
+    def _iter_windows_examples(self, filepath, zdelimiter, window):
+        chunks = self._iter_decoded_chunks(filepath, window)
+
+        # buf[0] is the begin of the line <lineno>;
+        # the zones are searched from buf[pos]
+        buf, pos, lineno = '', 0, 1
+        eof = False
+        stalled = False
+
+        nexamples = nzones = 0
+        while True:
+            # fill the buffer with at least two windows or, if the previous
+            # round did not consume enough text, with one more window.
+            # If it did not consume anything, a zone larger than the
+            # buffer begins in it: double the buffer to find its end.
+            need = max(2 * window, len(buf) + window)
+            if stalled:
+                need = max(need, 2 * len(buf))
+            while not eof and len(buf) < need:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                else:
+                    buf += chunk
+
+            limit = None if eof else len(buf) - window
+            examples, zones, consumed = self._harvest_window(
+                zdelimiter, buf, pos, lineno, limit, filepath
+            )
+
+            nzones += zones
+            nexamples += len(examples)
+            yield examples
+
+            if eof:
+                break
+
+            stalled = consumed <= pos
+
+            # discard the consumed text but keep the line
+            # where it ends: we need it to search from there
+            cut = buf.rfind('\n', 0, consumed) + 1
+            lineno += buf.count('\n', 0, cut)
+            pos = consumed - cut
+            buf = buf[cut:]
+
+        clog().chat(
+            "Findings in file '%s' (streamed): %i examples in %i zones were found.",
+            filepath, nexamples, nzones
+        )
+
+    def _iter_decoded_chunks(self, filepath, size):
+        # decode like open(filepath, 'rt', encoding=...) does,
+        # including the translation of the new lines
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        decoder = io.IncrementalNewlineDecoder(decoder, translate=True)
+
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            try:
+                for begin in range(0, len(m), size):
+                    yield decoder.decode(m[begin:begin + size])
+                yield decoder.decode(b'', final=True)
+            except UnicodeDecodeError:
+                self._abort_on_decoding_error(filepath)
+
+    @log_context('byexample.find')
+    def _harvest_window(self, zdelimiter, buf, pos, lineno, limit, filepath):
+        line_index = LineIndex(buf, first_lineno=lineno)
+
+        # without a zone, the text before the limit can be discarded
+        consumed = len(buf) if limit is None else max(pos, limit)
+
+        # a zone that begins but does not end in the buffer is not
+        # matched and the regex keeps searching after its begin so
+        # the matches after it (if any) may be wrong: retry with a larger
+        # buffer from there
+        begin_re = zdelimiter.zone_begin_regex()
+        prev_end = pos
+
+        def unended_zone(endpos):
+            # the begin of a zone, not matched, in the text that
+            # would be discarded (it may go beyond it)
+            m = begin_re.search(buf, prev_end, endpos)
+            return m if m is not None and m.start() < consumed else None
+
+        zones = []
+        for match in zdelimiter.get_matches(buf, filepath, pos=pos):
+            if limit is not None:
+                unended = unended_zone(match.start())
+                if unended is not None:
+                    consumed = unended.start()
+                    break
+
+                if match.start() >= limit:
+                    break
+
+                if match.end() >= len(buf):
+                    # the zone may continue beyond the buffer,
+                    # retry with a larger buffer
+                    consumed = match.start()
+                    break
+
+            where = self._where_of(buf, match, line_index, filepath)
+            zone = self.get_zone(zdelimiter, match, where, line_index)
+            zones.append(zone)
+
+            consumed = max(consumed, match.end())
+            prev_end = match.end()
+        else:
+            if limit is not None:
+                unended = unended_zone(len(buf))
+                if unended is not None:
+                    consumed = unended.start()
+
+        examples = []
+        for finder in self.available_finders:
+            for zone in zones:
+                examples.extend(
+                    self.get_examples_using(
+                        finder, zone.string, zone.where.filepath,
+                        zone.where.start_lineno, zone.pos, zone.endpos,
+                        zone.line_index
+                    )
+                )
+
+        examples.sort(key=lambda this: (this.start_lineno, -this.end_lineno))
+        return examples, len(zones), consumed
+
+    def _get_zdelimiter(self, filepath):
         _, ext = os.path.splitext(filepath)
 
-        zdelimiter = self.zdelimiter_by_file_extension.get(
+        return self.zdelimiter_by_file_extension.get(
             ext, self.zdelimiter_by_file_extension['no-delimiter']
         )
+
+    @log_context('byexample.zones')
+    def _get_zones(self, string, filepath='<string>', line_index=None):
+        zdelimiter = self._get_zdelimiter(filepath)
         zones = self.get_zones_using(
-            zdelimiter, string, filepath, start_lineno=1
+            zdelimiter,
+            string,
+            filepath,
+            start_lineno=1,
+            line_index=line_index
         )
 
         clog().chat(
@@ -159,15 +400,22 @@ class ExampleHarvest(object):
 
     @log_context('byexample.find')
     def get_examples_from_string(self, string, filepath='<string>'):
+        # all the examples and zones of the file will refer to it
+        filepath = sys.intern(filepath)
         all_examples = []
-        zones = self._get_zones(string, filepath)
+
+        # index the lines of the file once: the zones that are not
+        # post-processed by their delimiter share it (see get_zone)
+        line_index = LineIndex(string)
+        zones = self._get_zones(string, filepath, line_index)
 
         for finder in self.available_finders:
             nexamples = 0
             for zone in zones:
                 examples = self.get_examples_using(
-                    finder, zone.str, zone.where.filepath,
-                    zone.where.start_lineno
+                    finder, zone.string, zone.where.filepath,
+                    zone.where.start_lineno, zone.pos, zone.endpos,
+                    zone.line_index
                 )
                 all_examples.extend(examples)
                 nexamples += len(examples)
@@ -256,57 +504,13 @@ class ExampleHarvest(object):
 
         '''
 
-        collision_free = False
-        while not collision_free:
-            collision_free = True
-            if not examples:
-                return examples  # pragma: no cover
-
-            prev = examples[0]
-            for i, example in enumerate(examples[1:], 1):
-                collision_type_1 = prev.start_lineno == example.start_lineno
-                collision_type_2 = not collision_type_1 and \
-                                    (example.end_lineno <= prev.end_lineno)
-                collision_type_3 = not collision_type_1 and \
-                                    not collision_type_2 and \
-                                    example.start_lineno <= prev.end_lineno
-
-                any_collision = collision_type_1 or collision_type_2 or collision_type_3
-                if not any_collision:
-                    prev = example
-                    continue
-
-                collision_free = not any_collision
-                curr_where = Where(
-                    example.start_lineno, example.end_lineno, filepath,
-                    example.zdelimiter
-                )
-                prev_where = Where(
-                    prev.start_lineno, prev.end_lineno, filepath,
-                    prev.zdelimiter
-                )
+        if not examples:
+            return examples  # pragma: no cover
 
-                self._log_debug(" * Collision Type (1/2/3): %s/%s/%s\n"        \
-                                " * Languages (prev/current): %s/%s\n"         \
-                                    % (collision_type_1, collision_type_2,
-                                        collision_type_3, prev.runner.language,
-                                        example.runner.language), curr_where)
-                prev.pretty_print()
-                example.pretty_print()
+        kept = list(self._iter_without_overlap(examples, filepath))
 
-                if collision_type_2:
-                    del examples[i]
-                    self._log_drop("inner example", curr_where)
-                    break
-
-                msg = "In %s, examples at lines %i-%i (found by %s) and " +\
-                      "at lines %i-%i (found by %s) overlap each other."
-                msg = msg % (
-                    filepath, example.start_lineno, example.end_lineno,
-                    example.finder, prev.start_lineno, prev.end_lineno,
-                    prev.finder
-                )
-                raise ValueError(msg)
+        # drop the inner examples from the given list (in place)
+        examples[:] = kept
 
         if clog().isEnabledFor(CHAT):
             clog().debug("Examples after removing any overlapping")
@@ -317,11 +521,62 @@ class ExampleHarvest(object):
                     str(finder)
                 )
 
-        if True or clog().isEnabledFor(DEBUG):
             for e in examples:
                 e.pretty_print()
         return examples
 
+    def _iter_without_overlap(self, examples, filepath):
+        # A single sweep is enough: because the examples are sorted,
+        # an example can only collide with the last example kept (prev).
+        # An inner example (collision type 2) is dropped and prev is
+        # kept so the next examples are checked against it too.
+        pretty_print = clog().isEnabledFor(CHAT)
+        prev = None
+        for example in examples:
+            if prev is None:
+                prev = example
+                yield example
+                continue
+
+            collision_type_1 = prev.start_lineno == example.start_lineno
+            collision_type_2 = not collision_type_1 and \
+                                (example.end_lineno <= prev.end_lineno)
+            collision_type_3 = not collision_type_1 and \
+                                not collision_type_2 and \
+                                example.start_lineno <= prev.end_lineno
+
+            any_collision = collision_type_1 or collision_type_2 or collision_type_3
+            if not any_collision:
+                prev = example
+                yield example
+                continue
+
+            curr_where = Where(
+                example.start_lineno, example.end_lineno, filepath,
+                example.zdelimiter
+            )
+
+            self._log_debug(" * Collision Type (1/2/3): %s/%s/%s\n"        \
+                            " * Languages (prev/current): %s/%s\n"         \
+                                % (collision_type_1, collision_type_2,
+                                    collision_type_3, prev.runner.language,
+                                    example.runner.language), curr_where)
+            if pretty_print:
+                prev.pretty_print()
+                example.pretty_print()
+
+            if collision_type_2:
+                self._log_drop("inner example", curr_where)
+                continue
+
+            msg = "In %s, examples at lines %i-%i (found by %s) and " +\
+                  "at lines %i-%i (found by %s) overlap each other."
+            msg = msg % (
+                filepath, example.start_lineno, example.end_lineno,
+                example.finder, prev.start_lineno, prev.end_lineno, prev.finder
+            )
+            raise ValueError(msg)
+
     def _log_drop(self, reason, where):
         self._log_debug(" => Dropped example: " + reason, where)
 
@@ -329,16 +584,44 @@ class ExampleHarvest(object):
         clog().debug(build_where_msg(where, self, what))
 
     @profile
-    def get_examples_using(self, finder, string, filepath, start_lineno):
+    def get_examples_using(
+        self,
+        finder,
+        string,
+        filepath,
+        start_lineno,
+        pos=0,
+        endpos=None,
+        line_index=None
+    ):
         return self.from_string_get_items_using(
-            finder, string, self.get_example, 'examples', filepath,
-            start_lineno
+            finder,
+            string,
+            self.get_example,
+            'examples',
+            filepath,
+            start_lineno,
+            pos=pos,
+            endpos=endpos,
+            line_index=line_index
         )
 
     @profile
-    def get_zones_using(self, zdelimiter, string, filepath, start_lineno):
+    def get_zones_using(
+        self, zdelimiter, string, filepath, start_lineno, line_index=None
+    ):
+        if line_index is None:
+            line_index = LineIndex(string, first_lineno=start_lineno)
+
+        getter = functools.partial(self.get_zone, line_index=line_index)
         return self.from_string_get_items_using(
-            zdelimiter, string, self.get_zone, 'zones', filepath, start_lineno
+            zdelimiter,
+            string,
+            getter,
+            'zones',
+            filepath,
+            start_lineno,
+            line_index=line_index
         )
 
     def get_example(self, finder, match, where):
@@ -387,10 +670,67 @@ class ExampleHarvest(object):
             )
             return example
 
-    def get_zone(self, zdelimiter, match, where):
+    def get_zone(self, zdelimiter, match, where, line_index=None):
+        r'''
+        Build a Zone from the match of the zone delimiter.
+
+        If the delimiter does not post-process the zone (it does not
+        override ZoneDelimiter.get_zone) and the zone begins at the
+        begin of the first line of the match, the zone is a window
+        (pos/endpos) over the original string sharing its <line_index>.
+
+        Any other zone is a copy with its own line index.
+
+            >>> from byexample.finder import ExampleHarvest, LineIndex
+            >>> from byexample.modules.delimiters import NoDelimiter, MarkdownFencedCodeDelimiter
+            >>> f = ExampleHarvest(_dummy_cfg())
+
+            >>> string = 'foo\n```\nbar\n```\n'
+            >>> line_index = LineIndex(string)
+
+            >>> zdelimiter = NoDelimiter(cfg=_dummy_cfg())
+            >>> zone, = f.get_zones_using(zdelimiter, string, 'foo.md', 1, line_index)
+            >>> zone.string is string, zone.pos, zone.endpos
+            (True, 0, None)
+            >>> zone.line_index is line_index
+            True
+
+            >>> zdelimiter = MarkdownFencedCodeDelimiter(cfg=_dummy_cfg())
+            >>> zone, = f.get_zones_using(zdelimiter, string, 'foo.md', 1, line_index)
+            >>> zone.string, zone.pos, zone.endpos
+            ('\nbar\n', 0, None)
+            >>> zone.line_index.lineno_of(1)  # 'bar' is in the 3rd line
+            3
+        '''
         with enhance_exceptions(where, zdelimiter):
+            if line_index is not None and \
+                    type(zdelimiter).get_zone is ZoneDelimiter.get_zone:
+                string = match.string
+                pos, endpos = match.span('zone')
+
+                if (pos == 0 or string[pos - 1] == '\n') and \
+                        line_index.lineno_of(pos) == where.start_lineno:
+                    if pos == 0 and endpos == len(string):
+                        endpos = None  # the whole string, not a window
+
+                    return Zone(
+                        zdelimiter,
+                        string,
+                        where,
+                        pos=pos,
+                        endpos=endpos,
+                        line_index=line_index
+                    )
+
             zone_str = zdelimiter.get_zone(match, where)
-            return Zone(zdelimiter, zone_str, where)
+            return Zone(
+                zdelimiter,
+                zone_str,
+                where,
+                line_index=LineIndex(
+                    zone_str, first_lineno=where.start_lineno
+                )
+            )
 
     def from_string_get_items_using(
         self,
@@ -400,38 +740,127 @@ class ExampleHarvest(object):
         what,
         filepath='<string>',
         start_lineno=1,
-        zdelimiter=None
+        zdelimiter=None,
+        pos=0,
+        endpos=None,
+        line_index=None
     ):
-        charno = 0
-        items = []
+        r'''
+        Find the items (examples or zones) in the string using the
+        matcher (a finder or a zone delimiter) and build each of them
+        calling the getter.
+
+        The line numbers of each item are computed from the <line_index>
+        of the string (or from a new index if none is given, where the
+        first line is <start_lineno>).
 
-        for match in matcher.get_matches(string, filepath):
-            str_matched = string[match.start():match.end()]
-            if str_matched.endswith('\n'):
-                str_matched = str_matched[:-1]
+        If <pos> and/or <endpos> are given, only the string[pos:endpos]
+        window is searched (see ZoneDelimiter.get_matches).
+        '''
+        items = []
 
-            # start_lineno and end_lineno are inclusive
-            start_lineno += string[charno:match.start()].count('\n')
-            end_lineno = start_lineno + str_matched.count('\n')
+        if line_index is None:
+            line_index = LineIndex(string, first_lineno=start_lineno)
 
-            # update charno here
-            charno = match.start()
+        if pos == 0 and endpos is None:
+            matches = matcher.get_matches(string, filepath)
+        else:
+            matches = matcher.get_matches(
+                string, filepath, pos=pos, endpos=endpos
+            )
 
+        for match in matches:
             # where we are, used for the messages of the exceptions
-            where = Where(start_lineno, end_lineno, filepath, zdelimiter)
+            where = self._where_of(
+                string, match, line_index, filepath, zdelimiter
+            )
 
             item = getter(matcher, match, where)
             if item is not None:
                 items.append(item)
         return items
 
+    def _where_of(self, string, match, line_index, filepath, zdelimiter=None):
+        start, end = match.span()
+        if end > start and string[end - 1] == '\n':
+            end -= 1
+
+        # start_lineno and end_lineno are inclusive
+        start_lineno = line_index.lineno_of(start)
+        end_lineno = line_index.lineno_of(end)
+
+        return Where(start_lineno, end_lineno, filepath, zdelimiter)
+
+
+class LineIndex(object):
+    r'''
+    Map the character offsets of a string to line numbers (and back).
+
+    The offsets of the begin of each line are computed once so
+    looking up the line number of any offset does not require to
+    slice nor to count the new lines of the string again.
+
+        >>> from byexample.finder import LineIndex
+
+        >>> string = 'hello\nworld\n\n!!'
+        >>> line_index = LineIndex(string)
+        >>> len(line_index)
+        4
+
+        >>> line_index.lineno_of(0), line_index.lineno_of(6)
+        (1, 2)
+        >>> line_index.lineno_of(8)     # the 'r' of 'world'
+        2
+        >>> line_index.lineno_of(len(string))
+        4
+
+        >>> line_index.offset_of(2)     # offset of the 2nd line 'world'
+        6
+
+    The first line may have a number other than 1 (useful to index
+    a piece of a larger string):
+
+        >>> line_index = LineIndex(string, first_lineno=10)
+        >>> line_index.lineno_of(6), line_index.offset_of(11)
+        (11, 6)
+    '''
+    __slots__ = ('first_lineno', 'offsets')
+
+    def __init__(self, string, first_lineno=1):
+        self.first_lineno = first_lineno
+
+        offsets = array.array('L', [0])
+        find = string.find
+        nl = find('\n')
+        while nl != -1:
+            offsets.append(nl + 1)
+            nl = find('\n', nl + 1)
+
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def lineno_of(self, charno):
+        return bisect.bisect_right(
+            self.offsets, charno
+        ) - 1 + self.first_lineno
+
+    def offset_of(self, lineno):
+        idx = lineno - self.first_lineno
+        if idx < 0:
+            raise IndexError("Line %i is before the first line" % lineno)
+        return self.offsets[idx]
+
 
 class ExampleFinder(Extension):
     def example_regex(self):
         raise NotImplementedError()  # pragma: no cover
 
-    def get_matches(self, string, filepath='<string>'):
-        return self.example_regex().finditer(string)
+    def get_matches(self, string, filepath='<string>', pos=0, endpos=None):
+        if endpos is None:
+            endpos = len(string)
+        return self.example_regex().finditer(string, pos, endpos)
 
     def get_language_of(self, options, match, where):
         raise NotImplementedError()  # pragma: no cover
@@ -577,8 +1006,31 @@ class ZoneDelimiter(Extension):
     def zone_regex(self):
         raise NotImplementedError()  # pragma: no cover
 
-    def get_matches(self, string, filepath='<string>'):
-        return self.zone_regex().finditer(string)
+    def zone_begin_regex(self):
+        r'''
+        Return a regex that matches the begin of a zone only (like its
+        open marker) or None.
+
+        It is used to read a file window by window: if a zone begins
+        but it does not end in the window, more text is read until its
+        end is found (see ExampleHarvest._stream_examples_from_file).
+
+        The files of a delimiter without this regex are read at once.
+        '''
+        return None
+
+    def get_matches(self, string, filepath='<string>', pos=0, endpos=None):
+        r'''
+        Return an iterable of matches of zones in the string.
+
+        The matches must be searched only in the string[pos:endpos]
+        window but the offsets of the matches are relative to the
+        begin of the whole string (like re's finditer does).
+        The same goes for ExampleFinder.get_matches.
+        '''
+        if endpos is None:
+            endpos = len(string)
+        return self.zone_regex().finditer(string, pos, endpos)
 
     def get_zone(self, match, where):
         return match.group('zone')
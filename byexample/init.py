@@ -11,6 +11,7 @@ from .executor import FileExecutor
 from .differ import Differ
 from .parser import ExampleParser
 from .concern import Concern, ConcernComposite
+from .daemon import DaemonOutput
 from .common import enhance_exceptions
 from .log import clog, log_context, configure_log_system, setLogLevels, TRACE, DEBUG, CHAT, INFO, NOTE, ERROR, CRITICAL, init_thread_specific_log_system, log_with
 from .prof import profile
@@ -376,6 +377,20 @@ def _range(x):
     return (min, max)
 
 
+def _size(x):
+    x = str(x).strip().upper()
+    mult = 1
+    if x and x[-1] in 'KMG':
+        mult = 1024**('KMG'.index(x[-1]) + 1)
+        x = x[:-1]
+
+    size = int(x) * mult
+    if size < 0:
+        raise ValueError("Invalid size %s" % x)
+
+    return size
+
+
 def get_default_options_parser(cmdline_args):
     options_parser = OptionParser()
     options_parser.add_flag(
@@ -491,6 +506,29 @@ def get_default_options_parser(cmdline_args):
         "apply an active echo filtering for the languages selected (this is an experimental feature, it will break your tests if no echo is received and it will force a full terminal emulation (see +term=ansi and +geometry))."
     )
 
+    options_parser.add_flag(
+        "block-send",
+        default=False,
+        help=
+        "send the whole example to the interpreter in a single write instead of line by line; only for the runners that support it."
+    )
+
+    options_parser.add_flag(
+        "sentinel",
+        default=False,
+        help=
+        "send the whole example and detect its end waiting for a random marker printed after it instead of waiting for the prompts; only for the runners that support it."
+    )
+
+    options_parser.add_argument(
+        "+max-output",
+        metavar='<size>',
+        default=0,
+        type=_size,
+        help=
+        "limit the output of an example to <size> chars (K, M and G suffixes are allowed): the rest is saved in a temporal file and the example fails; 0 disables the limit (default)."
+    )
+
     options_parser.add_flag(
         "filter-esc-seqs",
         default=True,
@@ -526,6 +564,14 @@ def get_options(args, cfg):
             'shebangs': args.shebangs,
             'difftool': args.difftool,
             'captured_env_vars': args.captured_env_vars,
+            'history': args.history,
+            'adaptive_timeout': args.adaptive_timeout,
+            'watch': args.watch,
+            'daemon': args.daemon,
+            # in watch and daemon modes, the runners are initialized
+            # again after running a file so they are ready for the next
+            # one (see FileExecutor.warm_up_runners)
+            'keep_runners_warm': args.watch or args.daemon is not None,
             'language_specific_defaults': {}
         }
     )
@@ -722,14 +768,14 @@ def _load_modules_and_init_cfg(args, sharer):
 
     verify_encodings(args.encoding, args.verbosity)
     cfg = {
-        'use_progress_bar': args.pretty == 'all' and \
+        'use_progress_bar': args.pretty == 'all' and args.daemon is None and \
                             not args.no_progress_bar,
         'use_colors': args.pretty == 'all',
         'quiet': args.quiet,
         'verbosity': args.verbosity,
         'encoding': args.encoding,
         'enc_error_handler': args.enc_error_handler,
-        'output': sys.stdout,
+        'output': sys.stdout if args.daemon is None else DaemonOutput(sys.stdout),
         'interact': False,
         'opts_from_cmdline': args.options_str,
         'dry': args.dry,
@@ -743,7 +789,8 @@ def _load_modules_and_init_cfg(args, sharer):
     testfiles = args.testfiles
 
     # ensure consistency: we cannot spawn more jobs than testfiles
-    assert cfg['jobs'] <= len(testfiles)
+    # (unless the testfiles are given later, like in daemon mode)
+    assert cfg['jobs'] <= len(testfiles) or not testfiles
 
     cfg['options'] = get_options(args, cfg)
 
@@ -809,14 +856,20 @@ def _load_modules_and_init_cfg(args, sharer):
 
 @log_context('byexample.init')
 @profile
-def init_byexample(args, sharer):
+def init_byexample(args, sharer, files_later=False):
+    ''' Load the modules and return the files to run and the
+        configuration.
+
+        Exit if there are no files to run unless <files_later> is True
+        (the files will be given later, like in daemon mode).
+        '''
     testfiles, cfg = _load_modules_and_init_cfg(args, sharer)
 
     if args.show_options:
         show_options(cfg)
         sys.exit(0)
 
-    if not testfiles:
+    if not testfiles and not files_later:
         if not cfg['quiet']:
             clog().error(
                 "No files were found (you passed %i files, %i were skipped)",
@@ -924,10 +977,13 @@ def _prepare_subprocess_call(target, dirnames, *, args=(), kwargs={}):
 
 
 @profile
-def init_worker(cfg, job_num):
+def init_worker(cfg, job_num, cancellation=None):
     ''' Initialize a worker with worker/job number is passed
         by parameter.
 
+        The <cancellation> event, if given, is passed to the
+        executor (see FileExecutor).
+
         The registry's elements (parsers, runners, concerns,
         zdelimiters and finders) from <cfg> are recreated and
         the rest are copied so the worker is initialized with
@@ -957,6 +1013,16 @@ def init_worker(cfg, job_num):
         differ = Differ(cfg)
 
         harvester = ExampleHarvest(cfg)
-        executor = FileExecutor(concerns, differ, cfg)
+        executor = FileExecutor(concerns, differ, cfg, cancellation)
+
+        # in daemon mode we don't know which files will be run so
+        # warm up the runners of all the selected languages
+        if cfg['options']['daemon'] is not None:
+            executor.warm_up_runners(
+                [
+                    r for r in cfg['registry']['runners'].values()
+                    if r.language in cfg['allowed_languages']
+                ]
+            )
 
         return harvester, executor
@@ -14,7 +14,7 @@ class Status:
     error = 3
 
 
-def worker(func, input, output, cfg, job_num):
+def worker(func, input, output, cfg, job_num, cancellation):
     ''' Generic worker: call <func> for each item pulled from
         the <input> queue until a None gets pulled.
 
@@ -22,10 +22,14 @@ def worker(func, input, output, cfg, job_num):
         result into <output> queue.
 
         After receiving a None, close the <output> queue.
+
+        The <cancellation> event is shared by all the workers:
+        when set, the current items should be cancelled (see loop()).
         '''
-    harvester, executor = init_worker(cfg, job_num)
+    harvester, executor = init_worker(cfg, job_num, cancellation)
     for item in iter(input.get, None):
         output.put(func(item, harvester, executor, cfg['dry']))
+        executor.warm_up_runners()
 
     harvester.close()
     executor.close()
@@ -47,7 +51,7 @@ class Jobs(object):
 
         self.njobs = njobs
 
-        self.Process, self.Manager, self.Queue = load_concurrency_engine(
+        self.Process, self.Manager, self.Queue, self.Event = load_concurrency_engine(
             concurrency_model
         )
 
@@ -68,29 +72,42 @@ class Jobs(object):
             and the <output> queue.
             '''
         njobs = self.njobs
-        assert njobs <= len(items)
+        # in daemon mode the items come later (see serve)
+        assert njobs <= len(items) or not items
 
         self.input = self.Queue()
         self.output = self.Queue()
+        self.cancellation = self.Event()
 
         self.processes = [
             self.Process(
                 target=worker,
                 name=str(n),
-                args=(func, self.input, self.output, cfg, n)
+                args=(
+                    func, self.input, self.output, cfg, n, self.cancellation
+                )
             ) for n in range(njobs)
         ]
         for p in self.processes:
             p.start()
 
-        # feed the workers with enough data so all of them can start to work
-        for item in items[:njobs]:
-            self.input.put(item)
-
         if clog().isEnabledFor(CHAT):
             for p in self.processes:
                 clog().chat("Worker %s.", p.name)
 
+        return self.feed_workers(items)
+
+    def feed_workers(self, items):
+        ''' Feed the workers with enough data so all of them can
+            start to work. Return the rest of the <items>.
+
+            This starts a new round: the cancellation of the previous one,
+            if any, is cleared (see loop). '''
+        self.cancellation.clear()
+        njobs = self.njobs
+        for item in items[:njobs]:
+            self.input.put(item)
+
         return items[njobs:]
 
     def ignore_sigint(self):
@@ -113,28 +130,36 @@ class Jobs(object):
         for p in self.processes:
             p.join()
 
-    def loop(self, nitems, rest, fail_fast):
+    def loop(
+        self, nitems, rest, fail_fast, keep_workers=False, on_result=None
+    ):
         ''' Loop <nitems> times fetching from <output> the
             result of each processed file done in background.
 
             For each fetch, send (feed) to the workers the next
             item in <rest>.
 
-            The loop will close the workers at the end; it will
-            return the exit status (see Status).
+            The loop will close the workers at the end unless
+            <keep_workers> is True; it will return the exit status
+            (see Status).
+
+            Each result is a tuple that starts with the failed, aborted,
+            user_aborted and error flags; if <on_result> is given, it is
+            called with each whole result.
 
             Cancel the loop earlier if a run fails and <fail_fast>
-            is True (keep in mind that because several jobs are running
-            in background, it is possible that some extra files gets
-            processed before closing the loop).
+            is True. The files that are being processed by the other
+            jobs in background are cancelled too: they stop at their next
+            example or interrupt their current one (see FileExecutor).
             '''
         exit_status = Status.ok
-        end_sentinels_sent = False
+        end_sentinels_sent = keep_workers
         keyboard_interrupt_received = False
+        self.user_aborted = False
         while nitems:
             with allow_sigint(self.interrupt_handler):
                 try:
-                    failed, aborted, user_aborted, error = self.output.get()
+                    result = self.output.get()
                 except KeyboardInterrupt:
                     keyboard_interrupt_received = True
 
@@ -143,19 +168,30 @@ class Jobs(object):
                     "User aborted. Waiting to finish the current active executions..."
                 )
                 failed = aborted = error = False
-                user_aborted = True
+                user_aborted = self.user_aborted = True
+            else:
+                failed, aborted, user_aborted, error = result[:4]
+                if on_result is not None:
+                    on_result(result)
 
             nitems -= 1
 
             if failed:
                 exit_status = max(exit_status, Status.failed)
 
-            if aborted or user_aborted:
+            # once cancelled, the other files are aborted because of
+            # the failure that triggered the cancellation: it alone
+            # sets the exit status
+            cancelled = self.cancellation.is_set()
+            if user_aborted or (aborted and not cancelled):
                 exit_status = max(exit_status, Status.aborted)
 
             if error:
                 exit_status = max(exit_status, Status.error)
 
+            if (failed or aborted) and fail_fast:
+                self.cancellation.set()
+
             if ((failed or aborted) and fail_fast) or user_aborted or error:
                 nitems -= len(rest)
                 rest = []
@@ -167,6 +203,102 @@ class Jobs(object):
                 end_sentinels_sent = True
                 self.stop_workers()
 
+        if not keep_workers:
+            self.join_jobs_allowing_sigint()
+
+        return exit_status
+
+    def watch(self, watcher, nitems, rest, fail_fast):
+        ''' Like loop() but once all the items were processed, wait
+            for some of them to change and process them again
+            (see --watch).
+
+            The workers (and their interpreters) are kept between the
+            rounds.
+
+            Stop watching when the user presses Ctrl-C or when a
+            module changes (see FileWatcher): the caller must reload
+            the modules and start again.
+
+            Return the exit status of the last round.
+            '''
+        while True:
+            exit_status = self.loop(nitems, rest, fail_fast, keep_workers=True)
+            if self.user_aborted:
+                break
+
+            clog().note("Waiting for changes (press Ctrl-C to stop)...")
+            with allow_sigint(self.interrupt_handler):
+                try:
+                    changed = watcher.wait_for_changes()
+                except KeyboardInterrupt:
+                    break
+
+            if watcher.modules_changed:
+                clog().note("Some modules changed, reloading...")
+                break
+
+            nitems = len(changed)
+            rest = self.feed_workers(changed)
+
+        self.stop_workers()
+        self.join_jobs_allowing_sigint()
+        return exit_status
+
+    def serve(self, server, fail_fast):
+        ''' Process the items requested by the clients of the
+            <server>, one request at a time (see --daemon).
+
+            The workers (and their interpreters) are kept between the
+            requests.
+
+            Stop serving when the user presses Ctrl-C or when a SIGTERM
+            is received (if it is received while serving a request,
+            stop after finishing it).
+
+            The exit status of each request is sent to its client;
+            return Status.ok unless the user aborted a request.
+            '''
+        waiting = False
+        terminated = False
+
+        def terminate(signum, frame):
+            nonlocal terminated
+            terminated = True
+            if waiting:
+                raise KeyboardInterrupt()
+
+        prev_sigterm_handler = signal.signal(signal.SIGTERM, terminate)
+        try:
+            exit_status = Status.ok
+            while not terminated:
+                clog().chat("Waiting for a client...")
+                with allow_sigint(self.interrupt_handler):
+                    try:
+                        waiting = True
+                        items = server.next_request()
+                    except KeyboardInterrupt:
+                        break
+                    finally:
+                        waiting = False
+
+                rest = self.feed_workers(items)
+                status = self.loop(
+                    len(items), rest, fail_fast, keep_workers=True
+                )
+                server.finish_request(status)
+
+                if self.user_aborted:
+                    exit_status = Status.aborted
+                    break
+
+            self.stop_workers()
+            self.join_jobs_allowing_sigint()
+            return exit_status
+        finally:
+            signal.signal(signal.SIGTERM, prev_sigterm_handler)
+
+    def join_jobs_allowing_sigint(self):
         keyboard_interrupt_received = False
         with allow_sigint(self.interrupt_handler):
             try:
@@ -181,15 +313,25 @@ class Jobs(object):
                 "but it will leave resources uncleaned (dangerous/unsafe)."
             )
 
-        return exit_status
-
-    def run(self, func, items, fail_fast, cfg):
+    def run(self, func, items, fail_fast, cfg, watcher=None, server=None):
         ''' Process all the <items> in background, aborting earlier
             if one fails and <fail_fast> is True (see loop()).
+
+            If a <watcher> is given, keep processing the items
+            that change (see watch()).
+
+            If a <server> is given, there are no <items>: process
+            the ones requested by its clients (see serve()).
             '''
         self.interrupt_handler = self.ignore_sigint()
         try:
             rest = self.spawn_jobs(func, items, cfg)
+            if server is not None:
+                return self.serve(server, fail_fast)
+
+            if watcher is not None:
+                return self.watch(watcher, len(items), rest, fail_fast)
+
             return self.loop(len(items), rest, fail_fast)
         finally:
             self.restore_sigint(self.interrupt_handler)
@@ -197,6 +339,11 @@ class Jobs(object):
 
 @contextlib.contextmanager
 def allow_sigint(handler):
+    if handler is None:
+        # signals cannot be handled here (we are not in the main thread)
+        yield
+        return
+
     try:
         signal.signal(signal.SIGINT, handler)
         yield
@@ -1,6 +1,5 @@
 from logging import Formatter, Logger, getLogger
 import sys, logging, inspect, os.path
-import contextlib
 
 from .common import colored, highlight_syntax, indent, is_byexample_in_dev_mode
 from .log_level import TRACE, DEBUG, CHAT, INFO, NOTE, WARNING, ERROR, CRITICAL
@@ -299,14 +298,44 @@ def clog():
     return _logger_stack[-1]
 
 
+# Cache of the loggers by name and of the child loggers by
+# (parent, name): the logging module keeps the loggers forever
+# so they can be cached but getLogger and getChild acquire a global
+# lock and build the full name on each call.
+_loggers_by_name = {}
+_children_by_parent = {}
+
+
+def _get_logger(name):
+    try:
+        return _loggers_by_name[name]
+    except KeyError:
+        logger = _loggers_by_name[name] = getLogger(name=name)
+        return logger
+
+
+def _get_child(parent, name):
+    try:
+        return _children_by_parent[(parent, name)]
+    except KeyError:
+        logger = _children_by_parent[(parent, name)] = parent.getChild(name)
+        return logger
+
+
 def log_context(logger_name):
     global _logger_stack
 
     def decorator(func):
+        current = None
+
         @functools.wraps(func)
         def wrapped(*args, **kargs):
+            nonlocal current
             assert _logger_stack
-            current = getLogger(name=logger_name)
+            if current is None:
+                # resolve it on the first call and not on the
+                # decoration: init_log_system may not be called yet
+                current = _get_logger(logger_name)
 
             try:
                 _logger_stack.append(current)
@@ -319,19 +348,37 @@ def log_context(logger_name):
     return decorator
 
 
-@contextlib.contextmanager
-def log_with(logger_name, child=True):
-    global _logger_stack
-    assert _logger_stack
-    if child:
-        current = _logger_stack[-1].getChild(logger_name)
-    else:
-        current = getLogger(name=logger_name)
+class log_with:
+    r'''
+    Context manager to log with <logger_name> logger: within the context,
+    clog() returns it. If <child> is True, the logger is a child of the
+    current one.
 
-    try:
-        _logger_stack.append(current)
-        yield current
-    finally:
+        >>> from byexample.log import init_log_system, log_with
+        >>> init_log_system()
+
+        >>> with log_with('foo') as log:
+        ...     log.name
+        'byexample.foo'
+
+        >>> with log_with('byexample.bar', child=False) as log:
+        ...     log.name
+        'byexample.bar'
+    '''
+    __slots__ = ('current', )
+
+    def __init__(self, logger_name, child=True):
+        assert _logger_stack
+        if child:
+            self.current = _get_child(_logger_stack[-1], logger_name)
+        else:
+            self.current = _get_logger(logger_name)
+
+    def __enter__(self):
+        _logger_stack.append(self.current)
+        return self.current
+
+    def __exit__(self, *args):
         _logger_stack.pop()
 
 
@@ -48,6 +48,20 @@ class Clipboard(Concern):
         self.clipboard = dict(self.envs)
         options['clipboard'] = self.clipboard
 
+        # count the examples that may read the clipboard (paste or
+        # conditional execution): once all of them were parsed, there is
+        # no need to capture anything.
+        # The count is unknown (None) if the reading is enabled from the
+        # command line or if the examples are streamed (the list is empty
+        # and it grows while they are found)
+        if options['paste'] or options.get('if', False) is not False or \
+                options.get('unless', True) is not True or not examples:
+            self.readers_left = None
+        else:
+            self.readers_left = sum(
+                1 for e in examples if self.READER_RE.search(e.snippet)
+            )
+
     @staticmethod
     def repl_from_clipboard(m, clipboard, missing):
         tag_name = m.groupdict()['name']
@@ -59,6 +73,9 @@ class Clipboard(Concern):
 
     PASTE_RE = re.compile(r"<(?P<name>(?:\w|-|\.)+)>")
 
+    # the options that read the clipboard; a false positive is harmless
+    READER_RE = re.compile(r"\+(?:paste|if|on|unless)\b")
+
     def before_build_regex(self, example, options):
         if not options['paste']:
             return
@@ -72,6 +89,9 @@ class Clipboard(Concern):
         # do not check for missings: we assume that they are capture tags
 
     def finish_parse(self, example, options, exception):
+        if self.readers_left and self.READER_RE.search(example.snippet):
+            self.readers_left -= 1
+
         if exception is not None:
             return
 
@@ -97,5 +117,12 @@ class Clipboard(Concern):
         got = getattr(example, 'got', None)
         if got == None:
             return  # probably the example failed so we didn't get any output
+
+        if self.readers_left == 0:
+            return  # nobody will read what we could capture
+
+        if all(n is None for n in example.expected.tags_by_idx.values()):
+            return  # no named tag, nothing to capture
+
         _, captured = example.expected.get_captures(example, got, options, 0)
         self.clipboard.update(captured)
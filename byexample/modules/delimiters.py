@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
 import ast, itertools
 import byexample.regex as re
-from byexample.finder import ZoneDelimiter
+from byexample.finder import ZoneDelimiter, LineIndex
 from byexample.common import constant
 from byexample.log import clog
 
@@ -44,6 +44,10 @@ class CppBlockCommentDelimiter(ZoneDelimiter):
             ''', re.DOTALL | re.MULTILINE | re.VERBOSE
         )
 
+    @constant
+    def zone_begin_regex(self):
+        return re.compile(r'^[ ]*/\*', re.MULTILINE)
+
     @constant
     def leading_asterisk(self):
         return re.compile(r'^[ \*]+(?=[^ \*]|$)', re.MULTILINE)
@@ -75,6 +79,10 @@ class HashCommentDelimiter(ZoneDelimiter):
             ''', re.MULTILINE | re.VERBOSE
         )
 
+    @constant
+    def zone_begin_regex(self):
+        return re.compile(r'^[ ]*\#', re.MULTILINE)
+
     @constant
     def leading_sharp(self):
         return re.compile(r'^[ ]*#', re.MULTILINE)
@@ -96,7 +104,29 @@ class DocStringDelimiter(ZoneDelimiter):
     def __repr__(self):
         return "''' ... ''' or \"\"\" ... \"\"\""
 
-    def get_matches(self, string, filepath='<string>'):
+    def get_matches(self, string, filepath='<string>', pos=0, endpos=None):
+        r'''
+            Return the matches of the docstrings and the strings at the
+            'module' level found in the string[pos:endpos] window.
+
+            The whole string is still parsed to know where the docstrings
+            are so it must be the whole source code.
+
+            >>> source = 'def f():\n  """f docstring """\n\ndef g():\n  """g docstring """\n'
+            >>> delimiter = DocStringDelimiter(cfg=_dummy_cfg())
+
+            >>> [m.group('zone') for m in delimiter.get_matches(source)]
+            ['f docstring', 'g docstring']
+
+            >>> [m.group('zone') for m in delimiter.get_matches(source, pos=30)]
+            ['g docstring']
+
+            >>> [m.group('zone') for m in delimiter.get_matches(source, endpos=30)]
+            ['f docstring']
+            '''
+        if endpos is None:
+            endpos = len(string)
+
         mstring_re, dstring_re = self.module_string_and_docstring_regexs()
 
         # Use 'search' and not 'match' because the starting point 'offset'
@@ -109,15 +139,18 @@ class DocStringDelimiter(ZoneDelimiter):
         offsets = self.near_offsets_of_docstrings(string, filepath)
         if offsets is None:
             # we got an error, rollback to the naive search
-            it1 = dstring_re.finditer(string)
+            it1 = dstring_re.finditer(string, pos, endpos)
         else:
-            it1 = (dstring_re.search(string, offset) for offset in offsets)
+            it1 = (
+                dstring_re.search(string, offset, endpos) for offset in offsets
+                if pos <= offset < endpos
+            )
 
         # Strings at the 'module' level
-        it2 = mstring_re.finditer(string)
+        it2 = mstring_re.finditer(string, pos, endpos)
 
-        # Combine the matches
-        matches_iter = itertools.chain(it1, it2)
+        # Combine the matches (a search may find nothing)
+        matches_iter = (m for m in itertools.chain(it1, it2) if m is not None)
 
         # Sort the matches by match's start position
         return sorted(matches_iter, key=lambda m: m.start())
@@ -141,11 +174,10 @@ class DocStringDelimiter(ZoneDelimiter):
             >>> source[offsets[2]:offsets[2]+5] # get part of the line
             'world'
             '''
-        offset = 0
         offsets = [None]  # lineno==0 has none offset
-        for lineno, line in enumerate(source.splitlines(), 1):
-            offsets.append(offset)
-            offset += len(line) + 1  # plus the new line char
+        offsets.extend(LineIndex(source).offsets)
+        if source.endswith('\n'):
+            del offsets[-1]  # there is no line after the last new line
 
         return offsets
 
@@ -224,7 +256,7 @@ class DocStringDelimiter(ZoneDelimiter):
             clog().warn(msg)
             return None
 
-        offsets = self.get_offset_by_lineno(source)
+        line_index = LineIndex(source)
 
         near_offsets = []
         for node in ast.walk(tree):
@@ -243,7 +275,7 @@ class DocStringDelimiter(ZoneDelimiter):
             assert start_lineno is not None
 
             start_lineno += 1  # the next line, it closer to the docstring
-            near_offsets.append(offsets[start_lineno])
+            near_offsets.append(line_index.offset_of(start_lineno))
 
         return near_offsets
 
@@ -273,5 +305,17 @@ class MarkdownFencedCodeDelimiter(ZoneDelimiter):
             ''', re.DOTALL | re.MULTILINE | re.VERBOSE
         )
 
+    @constant
+    def zone_begin_regex(self):
+        return re.compile(
+            r'''
+            ^[ ]*
+                (?:
+                    (?:```(?:``)*(?=[^`]))
+                    | (?:<!--)
+                )
+            ''', re.MULTILINE | re.VERBOSE
+        )
+
     def __repr__(self):
         return "``` ... ``` or <!-- ... -->"
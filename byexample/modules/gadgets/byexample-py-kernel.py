@@ -0,0 +1,109 @@
+''' A minimal Python kernel for byexample.
+
+Read framed requests from the stdin and run their blocks of code line
+by line as the interactive interpreter would do (code.InteractiveConsole):
+the expressions are printed with sys.displayhook, the exceptions are
+printed with their tracebacks and the blocks of code are completed
+with an empty line.
+
+A request is its sequence number in a line followed by the code.
+
+The output of the code (stdout and stderr) goes to the stderr of the
+kernel. After running each block of code, a framed completion record
+is written to the stdout of the kernel: the sequence number of the
+request, a space and its status:
+
+ - 'done' if the block was run
+ - 'incomplete' if the block of code was incomplete (it is discarded)
+ - 'interrupted' if the kernel was interrupted (SIGINT) outside of
+   the code
+
+A SIGINT interrupts the block of code being run (once); if there is none
+it is ignored: an interruption that arrives late, when the code already
+finished, must not break the kernel nor interrupt the next block.
+
+A frame is the length of the data in bytes in a line followed by the
+data encoded in utf-8.
+'''
+import code, os, signal, sys, types
+
+
+def _read_frame(f):
+    header = f.readline()
+    if not header:
+        return None
+    return f.read(int(header)).decode('utf-8')
+
+
+def _write_frame(f, data):
+    data = data.encode('utf-8')
+    f.write(b'%d\n' % len(data) + data)
+    f.flush()
+
+
+class _Interruptible(object):
+    ''' Raise KeyboardInterrupt on SIGINT but only once and only
+        while <running> is True. '''
+    def __init__(self):
+        self.running = False
+        signal.signal(signal.SIGINT, self._on_sigint)
+
+    def _on_sigint(self, signum, frame):
+        if self.running:
+            self.running = False
+            raise KeyboardInterrupt()
+
+
+def _main():
+    # keep the stdin and stdout for the protocol and make the stdin
+    # of the code empty and its stdout the stderr
+    requests = os.fdopen(os.dup(0), 'rb')
+    replies = os.fdopen(os.dup(1), 'wb')
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+
+    # run the code in its own __main__ module as python -i does
+    main = types.ModuleType('__main__')
+    main.__builtins__ = __builtins__
+    sys.modules['__main__'] = main
+    console = code.InteractiveConsole(main.__dict__, filename='<stdin>')
+
+    # only _run can be interrupted: reading the requests and writing the
+    # records cannot so the frames are never left half read or written
+    interruptible = _Interruptible()
+    while True:
+        request = _read_frame(requests)
+        if request is None:
+            break
+
+        seq, source = request.split('\n', 1)
+        try:
+            interruptible.running = True
+            status = _run(console, source)
+        except KeyboardInterrupt:
+            status = 'interrupted'
+        finally:
+            interruptible.running = False
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        _write_frame(replies, '%s %s' % (seq, status))
+
+
+def _run(console, source):
+    more = False
+    for line in source.split('\n'):
+        more = console.push(line)
+
+    if more:
+        console.resetbuffer()
+        return 'incomplete'
+
+    return 'done'
+
+
+if __name__ == '__main__':
+    _main()
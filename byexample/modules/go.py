@@ -342,6 +342,10 @@ class GoParser(ExampleParser):
 class GoInterpreter(ExampleRunner, PexpectMixin):
     language = 'go'
 
+    # the prompts are anchored to the begin of the line (^) so they
+    # must be searched in the whole output, not in a part of it
+    _bounded_prompt_search = False
+
     def __init__(self, **kargs):
         ExampleRunner.__init__(self, **kargs)
         PexpectMixin.__init__(
@@ -0,0 +1,162 @@
+from __future__ import unicode_literals
+import hashlib, json, math, os, time
+from byexample.concern import Concern
+from byexample.log import clog
+
+stability = 'experimental'
+
+
+class TimingHistory(Concern):
+    ''' Record how long each example took to run in a history directory
+        (see --history) and, with --adaptive-timeout, lower the timeout
+        of each example based on its history.
+
+        There is one history file for each file of examples (a file is
+        run by one job only). Each example is identified by its line and
+        the hash of its source so if it changes, its history is lost.
+        '''
+    target = 'timing-history'
+
+    # keep the last N durations of each example
+    max_samples = 16
+
+    # the durations required before lowering the timeout of an example
+    min_samples = 3
+
+    # the adaptive timeout is the given percentile of the durations
+    # times the factor, but not lower than the floor (in seconds)
+    percentile = 95
+    factor = 3
+    floor = 1
+
+    def __init__(self, **kargs):
+        Concern.__init__(self, **kargs)
+        options = self.cfg.options
+        self.dirpath = options['history']
+        self.adaptive = options['adaptive_timeout']
+
+        if not self.dirpath:
+            self.target = None  # disable ourselves
+
+    def start(self, examples, runners, filepath, options):
+        self.filepath = filepath
+        self.history = self._load(filepath)
+        self.seen = set()
+        self.begin = None
+        self.cancelled_run = False
+
+    def finish_parse(self, example, options, exception):
+        if exception is not None:
+            return
+
+        key = example.history_key = self._key(example)
+        self.seen.add(key)
+
+        if not self.adaptive:
+            return
+
+        durations = self.history.get(key, ())
+        if len(durations) < self.min_samples:
+            return
+
+        options.up(example.options)
+        declared = options['timeout']
+        options.down()
+
+        timeout = max(
+            self.factor * _percentile(durations, self.percentile), self.floor
+        )
+        if timeout < declared:
+            # the parser shares the options between examples with the same
+            # options so we must not modify them in place
+            example.options = example.options.copy()
+            example.options['timeout'] = timeout
+            example.add_note_on_failure(
+                "The timeout was lowered from %0.2f to %0.2f seconds by --adaptive-timeout."
+                % (declared, timeout)
+            )
+            clog().chat(
+                "Adaptive timeout: %0.2f seconds (declared %0.2f).",
+                timeout,
+                declared,
+                example=example
+            )
+
+    def start_example(self, example, options):
+        self.begin = time.monotonic()
+
+    def finish_example(self, example, options):
+        # only the examples that finished normally are recorded:
+        # the time of a timed out or crashed example says nothing
+        elapsed = time.monotonic() - self.begin
+
+        durations = self.history.setdefault(example.history_key, [])
+        durations.append(round(elapsed, 3))
+        del durations[:-self.max_samples]
+
+    def cancelled(self, example, options):
+        self.cancelled_run = True
+
+    def finish(self, failed, user_aborted, crashed, broken, timedout):
+        # forget the examples that do not exist anymore unless
+        # the execution was interrupted (we may not have seen all of them)
+        # by the user, a crash, a timeout not recovered or a cancellation
+        interrupted = user_aborted or crashed or broken or timedout or \
+                self.cancelled_run
+        if not interrupted:
+            self.history = {
+                k: v
+                for k, v in self.history.items() if k in self.seen
+            }
+
+        self._save(self.filepath, self.history)
+
+    @staticmethod
+    def _key(example):
+        h = hashlib.sha1(example.source.encode('utf-8')).hexdigest()[:16]
+        return '%i:%s' % (example.start_lineno, h)
+
+    def _history_path(self, filepath):
+        name = os.path.abspath(filepath).encode('utf-8')
+        name = hashlib.sha1(name).hexdigest()[:16] + '.json'
+        return os.path.join(self.dirpath, name)
+
+    def _load(self, filepath):
+        path = self._history_path(filepath)
+        try:
+            with open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)['examples']
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, TypeError) as err:
+            clog().warn(
+                "The timing history %s of %s is corrupted (%s); it will be discarded.",
+                path, filepath, str(err)
+            )
+            return {}
+
+    def _save(self, filepath, history):
+        path = self._history_path(filepath)
+        os.makedirs(self.dirpath, exist_ok=True)
+
+        # write and then rename so a reader never sees a half-written file
+        tmp = path + '.tmp'
+        with open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump({'file': filepath, 'examples': history}, f, indent=1)
+        os.replace(tmp, path)
+
+
+def _percentile(values, p):
+    ''' Return the <p> percentile of the <values> (nearest-rank method).
+
+        >>> from byexample.modules.history import _percentile
+        >>> _percentile([4, 1, 3, 2], 50)
+        2
+        >>> _percentile([4, 1, 3, 2], 95)
+        4
+        >>> _percentile([1.5], 95)
+        1.5
+    '''
+    values = sorted(values)
+    rank = math.ceil(p / 100 * len(values))
+    return values[max(rank, 1) - 1]
@@ -120,6 +120,10 @@ class IAsmParser(ExampleParser):
 class IAsmInterpreter(ExampleRunner, PexpectMixin):
     language = 'iasm'
 
+    # the prompt is expected twice (see _expect_and_read): waiting for
+    # it in slices would break this
+    _cancellation_poll_interval = None
+
     def __init__(self, **kargs):
         ExampleRunner.__init__(self, **kargs)
 
@@ -107,6 +107,8 @@ class JavascriptParser(ExampleParser):
 
 class JavascriptInterpreter(ExampleRunner, PexpectMixin):
     language = 'javascript'
+    supports_block_send = True
+    supports_sentinel = True
 
     def __init__(self, **kargs):
         ExampleRunner.__init__(self, **kargs)
@@ -122,6 +124,9 @@ class JavascriptInterpreter(ExampleRunner, PexpectMixin):
             example.source, options, from_example=example
         )
 
+    def _sentinel_source(self, head, tail):
+        return "console.log('%s' + '%s')" % (head, tail)
+
     def interact(self, example, options):
         PexpectMixin.interact(self)
 
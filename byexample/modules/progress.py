@@ -1,5 +1,5 @@
 from __future__ import unicode_literals
-import traceback, time, os, sys
+import traceback, time, os, sys, threading, queue, atexit
 from byexample.executor import InputPrefixNotFound, InterpreterClosedUnexpectedly
 from byexample.common import colored, highlight_syntax, indent, short_string
 from byexample.concern import Concern
@@ -33,12 +33,19 @@ class SimpleReporter(Concern):
         # will use the same write_lock
         if self.cfg.job_number == '__main__':
             ns.write_lock = sharer.RLock()
+            ns.writer = _BatchedWriter(self.output, ns.write_lock)
 
         self.write_lock = ns.write_lock
+        self.writer = ns.writer
         self.header_printed = False
 
     def _write(self, msg, nl=False):
         ''' Call me once and just once per concern's method '''
+        if nl:
+            msg += '\n'
+        self.writer.write(msg)
+
+    def _write_sync(self, msg, nl=False):
         with self.write_lock:
             self.output.write(msg)
             if nl:
@@ -48,13 +55,20 @@ class SimpleReporter(Concern):
     def _update(self, x):
         pass
 
+    @property
+    def num_examples(self):
+        # the examples may be streamed and the list may grow
+        # (see Concern.start) so compute the total each time
+        return len(self.examples)
+
     def start(self, examples, runners, filepath, options):
-        self.num_examples = len(examples)
+        self.examples = examples
         self.examplenro = 0
         self.filepath = filepath
         self.begin = time.time()
 
         self.fail = self.good = self.skipped = 0
+        self.was_cancelled = False
 
     def finish(self, failed, user_aborted, crashed, broken, timedout):
         if self.num_examples == 0:
@@ -80,7 +94,7 @@ class SimpleReporter(Concern):
 
         ran_number = self.examplenro
         tot_number = self.num_examples
-        if user_aborted or crashed or broken or timedout:
+        if user_aborted or crashed or broken or timedout or self.was_cancelled:
             status_str = colored("[ABORT]", 'red', self.use_colors)
         elif failed:
             status_str = colored("[FAIL]", 'red', self.use_colors)
@@ -92,6 +106,7 @@ class SimpleReporter(Concern):
             self.good, self.fail, self.skipped
         )
         self._write(msg)
+        self.writer.flush()
 
     def skip_example(self, example, options):
         self.skipped += 1
@@ -105,6 +120,9 @@ class SimpleReporter(Concern):
         msg += "Escape character is '^]'.\n"
         self._write(msg)
 
+        # the interactive session writes directly to the output
+        self.writer.flush()
+
     def _bullet(self, color, marker="=>"):
         return colored(marker, color, self.use_colors)
 
@@ -163,6 +181,18 @@ class SimpleReporter(Concern):
         msg += 'Some resources may had not been cleaned.\n'
         self._write(msg)
 
+    def cancelled(self, example, options):
+        self.was_cancelled = True
+
+        msg = '\n'
+        msg += self._error_header(example, 'Cancelled example')
+
+        msg += self._bullet('red') + ' '
+        msg += 'Execution cancelled at example %i of %i: another file failed.\n' % (
+            self.examplenro, self.num_examples
+        )
+        self._write(msg)
+
     def crashed(self, example, exception):
         msg = '\n'
         msg += self._error_header(example)
@@ -298,7 +328,7 @@ class SimpleReporter(Concern):
 
         self._write(data['msg'], nl=True)
 
-    def _error_header(self, example):
+    def _error_header(self, example, title='Failed example'):
         if self.header_printed:
             return ''
 
@@ -309,7 +339,7 @@ class SimpleReporter(Concern):
         msg = "*" * 70
 
         msg += '\nFile "%s", line %i\n' % (filepath, lineno)
-        msg += "Failed example:\n"
+        msg += "%s:\n" % title
 
         msg += indent(highlight_syntax(example, self.use_colors))
         if not msg.endswith('\n'):
@@ -324,6 +354,124 @@ class SimpleReporter(Concern):
             return sys.exc_info()[2]
 
 
+class _BatchedWriter(object):
+    ''' Write the messages of all the workers into the <output>
+        from a single thread.
+
+        The workers only enqueue their messages so they do not wait
+        for each other nor for the output. The writer thread takes all
+        the pending messages and writes them at once, flushing the
+        output once per batch.
+
+        The messages are written in the order that they were enqueued
+        so the order of the messages of each worker is preserved.
+
+        >>> import io
+        >>> from threading import RLock
+        >>> from byexample.modules.progress import _BatchedWriter
+
+        >>> out = io.StringIO()
+        >>> w = _BatchedWriter(out, RLock())
+        >>> for i in range(3):
+        ...     w.write('msg %i\n' % i)
+
+        >>> w.flush()   # wait for the messages to be written
+        >>> print(out.getvalue())
+        msg 0
+        msg 1
+        msg 2
+
+        >>> w.close()
+    '''
+
+    # do not join more than these chars in a single write
+    max_batch_size = 1 << 16
+
+    def __init__(self, output, lock):
+        self.output = output
+        self.lock = lock
+        self.queue = queue.SimpleQueue()
+
+        self.thread = None
+        self.thread_lock = threading.Lock()
+
+    def write(self, msg):
+        if self.thread is None:
+            self._start()
+        self.queue.put(msg)
+
+    def flush(self):
+        ''' Block until all the messages enqueued so far are written '''
+        if self.thread is None:
+            return
+
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self):
+        ''' Write the pending messages and stop the writer thread '''
+        with self.thread_lock:
+            if self.thread is None:
+                return
+
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _start(self):
+        with self.thread_lock:
+            if self.thread is not None:
+                return
+
+            self.thread = threading.Thread(
+                target=self._loop, name='byexample-writer', daemon=True
+            )
+            self.thread.start()
+
+            # the thread is a daemon: write whatever is pending
+            # before the interpreter exits
+            atexit.register(self.close)
+
+    def _loop(self):
+        get, get_nowait = self.queue.get, self.queue.get_nowait
+        stop = False
+        while not stop:
+            batch, size, waiting = [], 0, []
+
+            item = get()
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                elif isinstance(item, threading.Event):
+                    waiting.append(item)
+                else:
+                    batch.append(item)
+                    size += len(item)
+                    if size >= self.max_batch_size:
+                        break
+
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                with self.lock:
+                    try:
+                        self.output.write(''.join(batch))
+                        self.output.flush()
+                    except (OSError, ValueError):
+                        pass  # the output was closed, nobody will read it
+                    except Exception:
+                        # keep running: the workers may be waiting a flush
+                        traceback.print_exc()
+
+            for done in waiting:
+                done.set()
+
+
 class ProgressBarReporter(SimpleReporter):
     def __init__(self, **kargs):
         SimpleReporter.__init__(self, **kargs)
@@ -366,7 +514,7 @@ class ProgressBarReporter(SimpleReporter):
     def _write(self, msg, nl=False):
         with self.write_lock:
             if self.bar is None:
-                SimpleReporter._write(self, msg, nl)
+                self._write_sync(msg, nl)
             else:
                 self._clear_all_bars()
                 end = '\n' if nl else ''
@@ -374,6 +522,8 @@ class ProgressBarReporter(SimpleReporter):
                 self.output.flush()
 
     def _update(self, x):
+        if self.bar.total != self.num_examples:
+            self.bar.total = self.num_examples
         self.bar.update(x)
 
     def start(self, examples, runners, filepath, options):
@@ -30,13 +30,14 @@ Example:
 """
 
 from __future__ import unicode_literals
-import pexpect, sys, time
+import pexpect, sys, time, os, select, signal, subprocess, codecs
 import byexample.regex as re
-from byexample.common import constant
+from byexample.common import constant, abspath, Countdown
 from byexample.log import clog
 from byexample.parser import ExampleParser, ExtendOptionParserMixin
 from byexample.finder import ExampleFinder
 from byexample.runner import ExampleRunner, PexpectMixin
+from byexample.executor import TimeoutException, ExecutionCancelled
 
 stability = 'stable'
 
@@ -199,6 +200,12 @@ class PythonParser(ExampleParser):
             default=True,
             help="enable the deletion of empty lines (enabled by default)."
         )
+        parser.add_flag(
+            "py-kernel",
+            default=False,
+            help=
+            "run the examples in a pipe-based kernel instead of an interactive interpreter in a terminal (set on the runner's initialization only)."
+        )
 
         if getattr(self, 'compatibility_mode', True):
             parser.add_flag(
@@ -484,8 +491,192 @@ class PythonParser(ExampleParser):
         return snippet
 
 
+class PythonKernel(object):
+    ''' Client of the pipe-based Python kernel
+        (see gadgets/byexample-py-kernel.py).
+
+        The code is sent to the kernel in a frame and the kernel
+        replies with a completion record in another frame once
+        the code finished. The output of the code is read from
+        a third pipe.
+
+        The requests are numbered and the records carry the number
+        of their request so a record of a previous request (if any)
+        is never taken as the record of the last one.
+
+        >>> import os, sys, time
+        >>> from byexample.common import Countdown
+        >>> from byexample.modules import python
+        >>> from byexample.modules.python import PythonKernel
+        >>> from byexample.log import init_log_system
+        >>> init_log_system()
+
+        >>> gadget = os.path.join(os.path.dirname(python.__file__), 'gadgets', 'byexample-py-kernel.py')
+        >>> kernel = PythonKernel([sys.executable, gadget], 'utf-8', 'strict', None)
+
+        >>> kernel.send('1 + 2')
+        >>> kernel.wait(Countdown(4))
+        ('done', '3\n')
+
+        If the code does not finish in time, its record arrives later
+        and it is dropped: it is not taken as the record of the next code.
+
+        >>> kernel.send('time = __import__("time"); time.sleep(0.5); print("late")')
+        >>> kernel.wait(Countdown(0.1))
+        (None, '')
+
+        >>> kernel.send('print("next")')
+        >>> kernel.wait(Countdown(4))
+        ('done', 'late\nnext\n')
+
+        An interruption that arrives when no code is running is ignored:
+
+        >>> kernel.interrupt(); time.sleep(0.2)
+        >>> kernel.send('print("still alive")')
+        >>> kernel.wait(Countdown(4))
+        ('done', 'still alive\n')
+
+        >>> kernel.close(timeout=1)
+        '''
+    def __init__(self, cmd, encoding, enc_error_handler, env):
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+
+        self._replies_fd = self._proc.stdout.fileno()
+        self._output_fd = self._proc.stderr.fileno()
+        os.set_blocking(self._output_fd, False)
+
+        self._decoder = codecs.getincrementaldecoder(encoding
+                                                     )(enc_error_handler)
+        self._replies = b''
+
+        # the number of the last request sent and if its record
+        # is still pending
+        self._seq = 0
+        self._pending = False
+
+    def send(self, source):
+        self._seq += 1
+        self._pending = True
+        data = ('%d\n%s' % (self._seq, source)).encode('utf-8')
+        self._proc.stdin.write(b'%d\n' % len(data) + data)
+        self._proc.stdin.flush()
+
+    # check the cancellation every these many seconds (see wait)
+    cancellation_poll_interval = 0.1
+
+    def wait(self, countdown, cancellation=None):
+        ''' Wait for the completion record of the last code sent
+            and return it with the output of the code.
+
+            The record is None if the <countdown> run out and it is
+            empty if the kernel closed.
+
+            If the <cancellation> event is set while waiting,
+            raise ExecutionCancelled.
+            '''
+        output = []
+        fds = [self._replies_fd, self._output_fd]
+        while True:
+            record = self._pop_record()
+            if record is not None:
+                # the kernel flushed the output before writing the record
+                # so it must be in the pipe already
+                self._read_output(output)
+                self._pending = False
+                return record, ''.join(output)
+
+            if cancellation is not None and cancellation.is_set():
+                raise ExecutionCancelled("Another job failed.")
+
+            left = countdown.left()
+            timeout = left
+            if cancellation is not None:
+                timeout = min(left, self.cancellation_poll_interval)
+
+            countdown.start()
+            readable, _, _ = select.select(fds, [], [], timeout)
+            countdown.stop()
+
+            if not readable:
+                if timeout < left:
+                    continue  # check the cancellation again
+                return None, ''.join(output)
+
+            if self._output_fd in readable:
+                if not self._read_output(output):
+                    fds.remove(self._output_fd)
+
+            if self._replies_fd in readable:
+                data = os.read(self._replies_fd, 4096)
+                if not data:
+                    self._read_output(output)
+                    return '', ''.join(output)
+                self._replies += data
+
+    def _read_output(self, output):
+        ''' Read all the available output without blocking.
+            Return False if the pipe was closed.
+            '''
+        while True:
+            try:
+                data = os.read(self._output_fd, 65536)
+            except BlockingIOError:
+                return True
+            except OSError:
+                return False
+
+            if not data:
+                return False
+            output.append(self._decoder.decode(data))
+
+    def _pop_record(self):
+        ''' Return the status of the record of the last request, None if
+            it was not received yet. The records of previous requests are
+            discarded. '''
+        while True:
+            header, sep, rest = self._replies.partition(b'\n')
+            if not sep or len(rest) < int(header):
+                return None
+
+            sz = int(header)
+            self._replies = rest[sz:]
+            seq, status = rest[:sz].decode('utf-8').split(' ', 1)
+            if int(seq) == self._seq:
+                return status
+
+            clog().debug("Dropped a stale record of the kernel: %s", status)
+
+    def is_pending(self):
+        ''' Return True if the record of the last request was not
+            received yet. '''
+        return self._pending
+
+    def interrupt(self):
+        self._proc.send_signal(signal.SIGINT)
+
+    def close(self, timeout):
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout)
+        except Exception as ex:
+            clog().debug("Python kernel did not exit (may happen): %s.", ex)
+            self._proc.kill()
+            self._proc.wait()
+
+        self._proc.stdout.close()
+        self._proc.stderr.close()
+
+
 class PythonInterpreter(ExampleRunner, PexpectMixin):
     language = 'python'
+    supports_block_send = True
+    supports_sentinel = True
     flavors = {'python3', 'python'}
 
     def __init__(self, **kargs):
@@ -502,6 +693,8 @@ class PythonInterpreter(ExampleRunner, PexpectMixin):
             self, PS1_re=self._PS1, any_PS_re=r'/byexample/py/ps\d> '
         )
 
+        self._kernel = None
+
     def get_default_cmd(self, *args, **kargs):
         p = self._python_flavor
         return "%e %p %a", {
@@ -512,6 +705,19 @@ class PythonInterpreter(ExampleRunner, PexpectMixin):
             ]
         }
 
+    def get_default_kernel_cmd(self, *args, **kargs):
+        p = self._python_flavor
+        return "%e %p %a", {
+            'e':
+            "/usr/bin/env",
+            'p':
+            p,
+            'a': [
+                "-u",  # unbuffered, so stdout and stderr are in order
+                abspath(__file__, 'gadgets', 'byexample-py-kernel.py'),
+            ]
+        }
+
     def get_default_version_cmd(self, *args, **kargs):
         p = self._python_flavor
         return "%e %p %a", {
@@ -562,43 +768,145 @@ if True:
             example.source, options, from_example=example
         )
 
+    def _exec_and_wait(self, source, options, *, from_example=None, **kargs):
+        if self._kernel is None:
+            return PexpectMixin._exec_and_wait(
+                self, source, options, from_example=from_example, **kargs
+            )
+
+        if from_example is None:
+            input_list = kargs.get('input_list', [])
+        else:
+            input_list = kargs.get('input_list', from_example.input_list)
+
+        if input_list:
+            clog().warn(
+                "The inputs were not typed: the kernel (+py-kernel) does not support +type."
+            )
+
+        timeout = kargs.get('timeout', options['timeout'])
+        countdown = Countdown(timeout)
+
+        self._kernel.send(source)
+        self._last_num_lines_sent = source.count('\n') + 1
+
+        record, output = self._kernel.wait(countdown, self.cancellation)
+        self._add_output(output)
+
+        if record is None or record == 'incomplete':
+            if record is None:
+                msg = "Kernel did not reply: the code is taking too long to finish."
+            else:
+                msg = "Incomplete code: there is a syntax error (may be you forgot a parenthesis or something like that?)."
+            msg += "\n\nLast 1000 bytes read:\n%s"
+
+            raw_output = ''.join(self._output_between_prompts)
+            msg = msg % raw_output[-1000:]
+            out = self._get_output(options)
+            raise TimeoutException(msg, out, raw_output)
+
+        elif not record:
+            self._interpreter_closed_unexpectedly_error(options)
+
+        return self._get_output(options)
+
     def _change_terminal_geometry(self, rows, cols, options):
         # update the pretty printer with the new columns value
         source = '__byexample_pretty_print.update_width(%i)' % cols
         self._exec_and_wait(
             source, options, timeout=options['x']['dfl_timeout']
         )
-        PexpectMixin._change_terminal_geometry(self, rows, cols, options)
+
+        if self._kernel is None:
+            PexpectMixin._change_terminal_geometry(self, rows, cols, options)
+        else:
+            self._screen.resize(rows, cols)
+
+    def _sentinel_source(self, head, tail):
+        return 'print(%r %r)' % (head, tail)
 
     def interact(self, example, options):
+        if self._kernel is not None:
+            clog().warn(
+                "The kernel (+py-kernel) does not support an interactive session."
+            )
+            return
         PexpectMixin.interact(self)
 
+    def _spawn_kernel(self, options):
+        cmd = self.build_cmd(
+            options, *self.get_default_kernel_cmd(), joined=False
+        )
+
+        rows, cols = options['geometry']
+        self._terminal_default_geometry = (rows, cols)
+
+        # the same environment that _spawn_interpreter sets even if
+        # there is no terminal
+        env = os.environ.copy()
+        env.update({'LINES': str(rows), 'COLUMNS': str(cols)})
+        env.update({'TERM': options['term_type'].strip()})
+
+        self._drop_output()
+        clog().info("Spawn command line: %s", ' '.join(cmd))
+
+        self._kernel = PythonKernel(
+            cmd, self.cfg.encoding, self.cfg.enc_error_handler, env
+        )
+        self._last_num_lines_sent = 0
+
+        # for +term=ansi
+        self._create_terminal(options)
+
     def initialize(self, options):
         py_doctest = options['py_doctest']
         py_pretty_print = options['py_pretty_print']
         pretty_print = (py_doctest and py_pretty_print) \
                         or not py_doctest
 
-        cmd = self.build_cmd(options, *self.get_default_cmd())
-
-        # run!
-        self._spawn_interpreter(cmd, options, initial_prompt=r'>>> ')
-
-        # change the prompts in the first line so by the moment that we
-        # wait for its completion we will be waiting for PS1 and PS2, the
-        # new prompts
-        self._exec_and_wait(
-            r'import sys; sys.ps1="%s" ; sys.ps2="%s"; del sys' %
-            (self._PS1, self._PS2),
-            options,
-            timeout=options['x']['dfl_timeout']
-        )
+        if options['py_kernel']:
+            self._spawn_kernel(options)
+        else:
+            cmd = self.build_cmd(options, *self.get_default_cmd())
+
+            # run!
+            self._spawn_interpreter(cmd, options, initial_prompt=r'>>> ')
+
+            # change the prompts in the first line so by the moment that we
+            # wait for its completion we will be waiting for PS1 and PS2, the
+            # new prompts
+            self._exec_and_wait(
+                r'import sys; sys.ps1="%s" ; sys.ps2="%s"; del sys' %
+                (self._PS1, self._PS2),
+                options,
+                timeout=options['x']['dfl_timeout']
+            )
 
         if pretty_print:
             self.conf_pretty_print(options['geometry'][1], options)
 
     def shutdown(self):
-        self._shutdown_interpreter()
+        if self._kernel is None:
+            self._shutdown_interpreter()
+            return
+
+        self._kernel.close(timeout=1)
+        self._kernel = None
 
     def cancel(self, example, options):
-        return self._abort(example, options)
+        if self._kernel is None:
+            return self._abort(example, options)
+
+        if not self._kernel.is_pending():
+            # the code finished (like an incomplete code): there is
+            # nothing to interrupt
+            self._drop_output()
+            return True
+
+        # wait for the completion record of the interrupted code
+        # (or of the code itself if it already finished and the
+        # interruption was ignored)
+        self._kernel.interrupt()
+        record, _ = self._kernel.wait(Countdown(options['x']['dfl_timeout']))
+        self._drop_output()
+        return bool(record)
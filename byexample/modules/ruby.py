@@ -142,6 +142,8 @@ class RubyParser(ExampleParser):
 
 class RubyInterpreter(ExampleRunner, PexpectMixin):
     language = 'ruby'
+    supports_block_send = True
+    supports_sentinel = True
 
     def __init__(self, **kargs):
         ExampleRunner.__init__(self, **kargs)
@@ -178,6 +180,9 @@ class RubyInterpreter(ExampleRunner, PexpectMixin):
         expected_str = example.expected.str
         return self._EXPR_RESULT_RE.search(expected_str) != None
 
+    def _sentinel_source(self, head, tail):
+        return "puts '%s' '%s'" % (head, tail)
+
     def interact(self, example, options):
         PexpectMixin.interact(self)
 
@@ -119,6 +119,8 @@ class ShellParser(ExampleParser):
 
 class ShellInterpreter(ExampleRunner, PexpectMixin):
     language = 'shell'
+    supports_block_send = True
+    supports_sentinel = True
 
     def __init__(self, **kargs):
         ExampleRunner.__init__(self, **kargs)
@@ -269,6 +271,20 @@ class ShellInterpreter(ExampleRunner, PexpectMixin):
                 self, options, countdown, prompt_re, earlier_re
             )
 
+    def _can_sync_by_sentinel(self, options, input_list):
+        # stopping the process on a timeout requires to wait for the
+        # prompts: the sentinel would be read and run by the shell
+        # after the process stopped
+        stop_on_timeout = options['stop_on_timeout'] is not False
+        stop_on_silence = options['stop_on_silence'] is not False
+        if stop_on_timeout or stop_on_silence:
+            return False
+
+        return PexpectMixin._can_sync_by_sentinel(self, options, input_list)
+
+    def _sentinel_source(self, head, tail):
+        return "echo '%s''%s'" % (head, tail)
+
     def interact(self, example, options):
         PexpectMixin.interact(self)
 
@@ -104,7 +104,7 @@ class Options(collections.abc.MutableMapping):
         >>> opt.down()
         Traceback (most recent call last):
         <...>
-        IndexError: list index out of range
+        IndexError: there is no level below the top
 
     If a key is not found, as any dictionary like, we will raise a KeyError
     exception.
@@ -150,71 +150,80 @@ class Options(collections.abc.MutableMapping):
         {'bar': 2, 'foo': 2}
     '''
     def __init__(self, *args, **kwargs):
-        self.top = dict()
-        self.stack = [self.top]  # [top, ...., bottom]
-
-        self.lower_levels_cached = {}
+        self._level = _Level({}, None, owned=True)
 
         self.update(dict(*args, **kwargs))  # use the free update to set keys
         self.default_values = []
 
     def __getitem__(self, key):
-        if key in self.top:
-            return self.top[key]
+        level = self._level
+        if key in level.mapping:
+            return level.mapping[key]
 
-        if self.lower_levels_cached is None:
-            for d in self.stack[1:-1]:
-                if key in d:
-                    return d[key]
+        below = level.below
+        if below is not None:
+            collapsed = below.collapsed
+            if collapsed is None:
+                collapsed = below.as_dict()
 
-            if self.default_values:
-                return self.stack[-1].get(key, self.default_values[-1])
-            else:
-                return self.stack[-1][key]  # found or KeyError
-        else:
-            if self.default_values:
-                return self.lower_levels_cached.get(
-                    key, self.default_values[-1]
-                )
-            else:
-                return self.lower_levels_cached[key]  # found or KeyError
+            if key in collapsed:
+                return collapsed[key]
+
+        if self.default_values:
+            return self.default_values[-1]
+
+        raise KeyError(key)
 
     def __setitem__(self, key, value):
-        self.top[key] = value
+        self._writable_top()[key] = value
 
     def __delitem__(self, key):
-        del self.top[key]
+        del self._writable_top()[key]
 
     def __iter__(self):
         return iter(self.as_dict())
 
     def __len__(self):
-        return len(self.as_dict())
+        return len(self._level.as_dict())
 
     def __repr__(self):
         return pprint.pformat(self.as_dict())
 
     def up(self, other_mapping=None):
         if isinstance(other_mapping, Options):
-            other_mapping = other_mapping.as_dict()
+            # share its (cached) collapsed view instead of copying it:
+            # it is never modified, we copy it only if we need to write
+            mapping, owned = other_mapping._level.as_dict(), False
 
         elif isinstance(other_mapping, argparse.Namespace):
-            other_mapping = vars(other_mapping)
+            mapping, owned = vars(other_mapping), False
 
         elif other_mapping is not None:
-            other_mapping = other_mapping.copy()
+            mapping, owned = other_mapping.copy(), True
 
-        if self.lower_levels_cached is not None:
-            self.lower_levels_cached.update(self.top)
+        else:
+            mapping, owned = {}, True
 
-        self.top = other_mapping if other_mapping is not None else {}
-        self.stack.insert(0, self.top)
+        self._level = _Level(mapping, self._level, owned)
 
     def down(self):
-        del self.stack[0]
-        self.top = self.stack[0]
+        below = self._level.below
+        if below is None:
+            raise IndexError("there is no level below the top")
+
+        self._level = below
+
+    def _writable_top(self):
+        level = self._level
+        if not level.owned:
+            # copy on write: the mapping is shared with someone else
+            level = self._level = _Level(
+                dict(level.mapping), level.below, owned=True
+            )
+        else:
+            level.collapsed = None
 
-        self.lower_levels_cached = None if len(self.stack) > 1 else {}
+        return level.mapping
 
     def with_top(self, other_mapping=None):
         return _OptionsContext(self, other_mapping)
@@ -247,18 +256,7 @@ class Options(collections.abc.MutableMapping):
             >>> opt.as_dict()
             {'bar': 2, 'baz': 4, 'foo': 3}
         '''
-        if self.lower_levels_cached is None:
-            collapsed = self.stack[-1].copy()
-            for d in reversed(self.stack[1:-1]):
-                collapsed.update(d)
-
-            self.lower_levels_cached = collapsed.copy()
-        else:
-            collapsed = self.lower_levels_cached.copy()
-
-        collapsed.update(self.top)
-
-        return collapsed
+        return self._level.as_dict().copy()
 
     def copy(self):
         r'''
@@ -288,15 +286,71 @@ class Options(collections.abc.MutableMapping):
             >>> opt                        # unmodified
             {'bar': 2, 'blaz': [1, 2, 3], 'foo': 1}
         '''
-        deep = copy.deepcopy
-        clone = Options(deep(self.stack[-1]))  # bottom
+        levels = []
+        level = self._level
+        while level is not None:
+            levels.append(level)
+            level = level.below
+
+        # the same memo for all the levels: a value shared by two levels
+        # is copied once and it is still shared in the copy
+        memo = {}
+        clone = Options()
+        clone._level = None
+        for level in reversed(levels):
+            mapping = copy.deepcopy(level.mapping, memo)
+            clone._level = _Level(mapping, clone._level, owned=True)
+
+        clone.default_values = copy.deepcopy(self.default_values, memo)
+        return clone
 
-        # clone pushing up
-        for s in reversed(self.stack[:-1]):
-            clone.up(deep(s))
 
-        clone.default_values = deep(self.default_values)
-        return clone
+class _Level(object):
+    r'''
+    A level in the stack of Options: a mapping and the level below it.
+
+    Only the top level of an Options can be modified so the levels below
+    are constant and their collapsed view (the mapping of the level merged
+    with the ones below) is computed once and cached.
+
+    Going up and down the stack does not invalidate the cache of the levels
+    below: when the top is removed, the new top already has its collapsed
+    view.
+
+        >>> from byexample.options import _Level
+        >>> bottom = _Level({'foo': 1, 'bar': 1}, None, owned=True)
+        >>> middle = _Level({'foo': 2}, bottom, owned=True)
+
+        >>> middle.as_dict()
+        {'bar': 1, 'foo': 2}
+
+        >>> middle.as_dict() is middle.as_dict()
+        True
+
+    The collapsed view must not be modified.
+    If the level is <owned> by the Options, its mapping can be modified
+    while it is the top (and the collapsed view reset); otherwise the
+    mapping is shared and it must be copied first.
+    '''
+    __slots__ = ('mapping', 'below', 'owned', 'collapsed')
+
+    def __init__(self, mapping, below, owned):
+        self.mapping = mapping
+        self.below = below
+        self.owned = owned
+        self.collapsed = None
+
+    def as_dict(self):
+        if self.collapsed is None:
+            if self.below is None:
+                collapsed = dict(self.mapping)
+            else:
+                collapsed = self.below.as_dict().copy()
+                collapsed.update(self.mapping)
+
+            self.collapsed = collapsed
+
+        return self.collapsed
 
 
 class _OptionsContext:
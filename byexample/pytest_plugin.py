@@ -0,0 +1,236 @@
+'''
+Run byexample within pytest: the files with examples are collected
+as pytest items and run by a byexample.api.Session that lives as long as
+the pytest session so the interpreters are kept warm between the items.
+
+The plugin is disabled unless the languages are given with --byexample.
+See docs/recipes/pytest.md.
+
+This module is loaded by pytest even if the plugin is not enabled so it
+must be cheap to import: do not import the rest of byexample here.
+'''
+import fnmatch, shlex
+import pytest
+
+_durations_key = 'byexample/durations'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('byexample')
+    group.addoption(
+        '--byexample',
+        metavar='<languages>',
+        default=None,
+        help='run the examples written in these languages '
+        '(comma separated) found in the files that match byexample_files.'
+    )
+    group.addoption(
+        '--byexample-options',
+        metavar='<options>',
+        default=None,
+        help="byexample's --options for all the examples."
+    )
+    group.addoption(
+        '--byexample-args',
+        metavar='<args>',
+        default='',
+        help="any other byexample's flags (like '--timeout 4')."
+    )
+    group.addoption(
+        '--byexample-per-example',
+        action='store_true',
+        help='collect each example as an item instead of each file '
+        '(use it with --dist loadfile).'
+    )
+    parser.addini(
+        'byexample_files',
+        type='linelist',
+        default=['*.md'],
+        help='glob patterns of the files with examples (default: *.md).'
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('byexample'):
+        config.pluginmanager.register(
+            ByexamplePlugin(config), 'byexample-session'
+        )
+
+
+class ByexamplePlugin(object):
+    ''' Own the byexample.api.Session, created the first time that a
+        file is collected, and record how long each file took. '''
+    def __init__(self, config):
+        self.config = config
+        self.patterns = config.getini('byexample_files')
+        self.per_example = config.getoption('byexample_per_example')
+
+        self.session = None
+        self.harvester = None
+
+        self.results = {}
+        self.durations = {}
+
+    def get_session(self):
+        if self.session is None:
+            from byexample.api import Session
+            from byexample.finder import ExampleHarvest
+
+            config = self.config
+            self.session = Session(
+                config.getoption('byexample').split(','),
+                options=config.getoption('byexample_options'),
+                args=shlex.split(config.getoption('byexample_args'))
+            )
+            self.harvester = ExampleHarvest(self.session.cfg)
+
+        return self.session
+
+    def run_file(self, path):
+        ''' Run the file (once) and return its FileResult. '''
+        path = str(path)
+        if path not in self.results:
+            result, = self.get_session().run([path])
+            self.results[path] = result
+
+        return self.results[path]
+
+    def pytest_collect_file(self, file_path, parent):
+        if any(fnmatch.fnmatch(file_path.name, p) for p in self.patterns):
+            return ByexampleFile.from_parent(parent, path=file_path)
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        ''' Sort the files from the slowest to the fastest based on
+            the last runs so the slowest are given first to the workers
+            (with pytest-xdist) and they do not end last. The items
+            that are not from byexample are not moved. '''
+        cache = getattr(config, 'cache', None)  # None if disabled
+        durations = cache.get(_durations_key, {}) if cache else {}
+        if not durations:
+            return
+
+        slots = [
+            i for i, item in enumerate(items)
+            if isinstance(item, ByexampleItem)
+        ]
+        ours = sorted(
+            (items[i] for i in slots),
+            key=lambda item: -durations.get(item.parent.nodeid, 0)
+        )
+        for i, item in zip(slots, ours):
+            items[i] = item
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, 'cache', None)
+        if self.durations and cache is not None:
+            durations = cache.get(_durations_key, {})
+            durations.update(self.durations)
+            cache.set(_durations_key, durations)
+
+    def pytest_unconfigure(self, config):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+class ByexampleFile(pytest.File):
+    def collect(self):
+        plugin = self.config.pluginmanager.get_plugin('byexample-session')
+        plugin.get_session()
+
+        examples = list(
+            plugin.harvester.iter_examples_from_file(str(self.path))
+        )
+        if not examples:
+            return
+
+        if not plugin.per_example:
+            yield ByexampleItem.from_parent(
+                self, name='byexample', plugin=plugin, lineno=None
+            )
+            return
+
+        for example in examples:
+            yield ByexampleItem.from_parent(
+                self,
+                name='line%i' % example.start_lineno,
+                plugin=plugin,
+                lineno=example.start_lineno
+            )
+
+
+class ByexampleFailure(Exception):
+    pass
+
+
+class ByexampleItem(pytest.Item):
+    ''' The whole file (<lineno> is None) or the example in <lineno>.
+
+        The file is run once: the items of the same file share the
+        result. '''
+    def __init__(self, *, plugin, lineno, **kargs):
+        super().__init__(**kargs)
+        self.plugin = plugin
+        self.lineno = lineno
+
+    def runtest(self):
+        result = self.plugin.run_file(self.path)
+        self.plugin.durations[self.parent.nodeid] = result.elapsed
+
+        if result.error is not None:
+            raise ByexampleFailure(result.error)
+
+        if self.lineno is None:
+            examples = result.examples
+        else:
+            examples = [
+                ex for ex in result.examples if ex.start_lineno == self.lineno
+            ]
+            if not examples:
+                pytest.skip("The example was not run.")
+
+            if examples[0].status == 'skip':
+                pytest.skip("The example was skipped.")
+
+        msgs = [
+            _failure_message(ex) for ex in examples
+            if ex.status not in ('pass', 'skip')
+        ]
+        if msgs:
+            raise ByexampleFailure('\n\n'.join(msgs))
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, ByexampleFailure):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        if self.lineno is None:
+            return self.path, None, "byexample: %s" % self.path.name
+
+        return self.path, self.lineno - 1, "byexample: %s:%i" % (
+            self.path.name, self.lineno
+        )
+
+
+def _failure_message(ex):
+    head = 'File "%s", line %i' % (ex.filepath, ex.start_lineno)
+    if ex.status == 'fail':
+        msg = '%s\nFailed example:\n%s\n%s' % (
+            head, _indent(ex.source), ex.diff
+        )
+    elif ex.status == 'timeout':
+        msg = '%s\nThe example timed out:\n%s' % (head, _indent(ex.source))
+    elif ex.status == 'crash':
+        msg = '%s\nThe example crashed:\n%s' % (head, _indent(ex.source))
+    else:
+        msg = '%s\nThe example was aborted:\n%s' % (head, _indent(ex.source))
+
+    for note in ex.notes:
+        msg += '\n- ' + note
+
+    return msg
+
+
+def _indent(source):
+    return '\n'.join('    ' + line for line in source.splitlines())
@@ -1,12 +1,13 @@
 from __future__ import unicode_literals
 import pexpect, pexpect.popen_spawn, time, operator, os, itertools, contextlib
+import secrets, collections, tempfile, threading, atexit
 
 import pprint
 import signal
 import subprocess
 from . import regex as re
 from functools import reduce, partial
-from .executor import TimeoutException, InputPrefixNotFound, InterpreterClosedUnexpectedly, InterpreterNotFound
+from .executor import TimeoutException, InputPrefixNotFound, InterpreterClosedUnexpectedly, InterpreterNotFound, ExecutionCancelled
 from .common import tohuman, ShebangTemplate, Countdown, short_string, constant
 from .example import Example
 from .log import clog, log_context, INFO, DEBUG, log_with
@@ -14,12 +15,29 @@ from .prof import profile, profile_ctx
 from .extension import Extension
 
 from termscraper import Stream, Screen, WSPassthroughStream, LinearScreen
+from termscraper.charsets import LAT1_MAP
 import sys
 
 
 class ExampleRunner(Extension):
     flavors = set()
 
+    # Set to True if the runner's interpreter can receive the whole
+    # source of an example in a single write (see +block-send)
+    supports_block_send = False
+
+    # Set to True if the runner can tell when an example finished
+    # printing a sentinel after it instead of waiting its prompts
+    # (see +sentinel and PexpectMixin._sentinel_source)
+    supports_sentinel = False
+
+    # The event shared by the jobs, set when another job failed in
+    # --fail-fast mode (None if there is none). It is set by the
+    # FileExecutor. A runner that waits for long should check it and
+    # raise ExecutionCancelled if it is set: the FileExecutor will call
+    # cancel() then.
+    cancellation = None
+
     def __repr__(self):
         return '%s Runner' % tohuman(self.language if self.language else self)
 
@@ -144,7 +162,8 @@ class ExampleRunner(Extension):
     def cancel(self, example, options):
         r'''
         Abort the execution of the current example. This method will typically
-        be called after the example timeout.
+        be called after the example timeout or after the example was
+        interrupted because another job failed (see cancellation).
 
         Return True if the cancel succeeded and the runner can be still used,
         False otherwise.
@@ -162,18 +181,64 @@ class ExampleRunner(Extension):
         return None
 
 
+_output_spill_dir = None
+_output_spill_dir_lock = threading.Lock()
+
+
+def _get_output_spill_dir():
+    ''' Return the temporal directory, the same for the whole run,
+        where the output beyond +max-output is saved
+        (see ReadFilter.limit_output).
+
+        The directory is removed at the exit if it is empty: the
+        executor removes the files that no failure note points to.
+        '''
+    global _output_spill_dir
+    with _output_spill_dir_lock:
+        if _output_spill_dir is None:
+            _output_spill_dir = tempfile.mkdtemp(prefix='byexample-output-')
+            atexit.register(_remove_output_spill_dir, _output_spill_dir)
+
+        return _output_spill_dir
+
+
+def _remove_output_spill_dir(dirname):
+    try:
+        os.rmdir(dirname)
+    except OSError:
+        pass  # not empty: some failure notes point to its files
+
+
 class ReadFilter:
+    # a chunk of text that the stream would pass as is to the screen:
+    # no escape sequence nor control character other than whitespaces
+    _plain_text_re = WSPassthroughStream._text_pattern
+
     def __init__(self):
         self.read_filtered_enabled = True
         self._screen = LinearScreen()
         self._stream = WSPassthroughStream(self._screen, trace_callbacks=False)
         self._were_unhandled_escape_sequences = False
 
+        self._fast_path_char_cnt = 0
+        self._total_char_cnt = 0
+
+        self._max_output = 0
+        self._spill = None
+
     def read_nonblocking(self, size=1, timeout=-1):
+        ret = self._read_nonblocking_filtered(size, timeout)
+        if self._max_output:
+            self._limit_output(ret)
+        return ret
+
+    def _read_nonblocking_filtered(self, size, timeout):
         ret = super().read_nonblocking(size, timeout)
         if not self.read_filtered_enabled:
             return ret
 
+        self._total_char_cnt += len(ret)
+
         # Resetting the screen state cleans it so we start with a
         # fresh screen to receive the text.
         # However this does not reset the stream parser state
@@ -181,6 +246,15 @@ class ReadFilter:
         # sequences even if a part falls in one read_nonblocking()
         # call and the rest falls in the next call.
         self._screen.reset_state()
+
+        # Fast path: most of the output is plain text that the screen
+        # would return unchanged. This is true only if the stream is not
+        # in the middle of an escape sequence (from a previous read) and
+        # the screen is not translating the text with a charset.
+        if self._is_plain_text(ret):
+            self._fast_path_char_cnt += len(ret)
+            return ret
+
         self._stream.feed(ret)
 
         # Track if we detected some unhandled sequences.
@@ -193,6 +267,95 @@ class ReadFilter:
         out = self._screen.current_text
         return out
 
+    def _is_plain_text(self, chunk):
+        return (
+            self._stream._taking_plain_text and self._screen.charset == 0
+            and self._screen.g0_charset is LAT1_MAP
+            and (not chunk or self._plain_text_re.fullmatch(chunk))
+        )
+
+    _truncated_output_marker = '\n<...output truncated...>\n'
+
+    def limit_output(self, max_output):
+        ''' Limit the output to read (from now on) to <max_output>
+            chars; 0 disables the limit.
+
+            The output beyond the limit is saved in a temporal
+            file (see end_limit_output and _get_output_spill_dir)
+            and only its last part is kept in memory, enough to find
+            the prompts.
+            '''
+        self.end_limit_output()
+        self._max_output = max_output
+        self._output_read_cnt = 0
+        self._head_len = None
+        self._head_of = None
+
+    def end_limit_output(self):
+        ''' Stop limiting the output and return the path to the file
+            with the output beyond the limit or None if the limit was not
+            exceeded.
+            '''
+        self._max_output = 0
+        if self._spill is None:
+            return None
+
+        self._spill.close()
+        path, self._spill = self._spill.name, None
+        return path
+
+    def _limit_output(self, ret):
+        # note: <ret> was not added yet to self._before, the
+        # output collected by pexpect
+        cnt = self._output_read_cnt = self._output_read_cnt + len(ret)
+        if cnt <= self._max_output:
+            return
+
+        if self._spill is None:
+            self._spill = tempfile.NamedTemporaryFile(
+                'wt',
+                encoding='utf-8',
+                errors='replace',
+                dir=_get_output_spill_dir(),
+                prefix='output-',
+                suffix='.txt',
+                delete=False
+            )
+
+            # keep in memory the output up to the limit
+            over = cnt - self._max_output
+            self._spill.write(ret[-over:])
+            self._head_len = self._before.tell() + len(ret) - over
+            self._head_of = self._before
+            return
+
+        self._spill.write(ret)
+
+        # pexpect searches the prompts in its last chars so we can
+        # drop the rest. Without a search window we cannot.
+        if not self.searchwindowsize:
+            return
+
+        if self._before is not self._head_of:
+            # pexpect found a prompt and started a new output
+            self._head_len = 0
+            self._head_of = self._before
+
+        tail = 2 * self.searchwindowsize
+        if self._before.tell() <= self._head_len + 2 * tail:
+            return
+
+        out = self._before.getvalue()
+        head = out[:self._head_len]
+        if not head.endswith(self._truncated_output_marker):
+            head += self._truncated_output_marker
+
+        self._before = self.buffer_type()
+        self._before.write(head + out[-tail:])
+
+        self._head_len = len(head)
+        self._head_of = self._before
+
     def were_unhandled_escape_sequences(self):
         return self._were_unhandled_escape_sequences
 
@@ -200,7 +363,10 @@ class ReadFilter:
         self._were_unhandled_escape_sequences = False
 
     def stats(self):
-        return self._screen.stats()
+        fast, total = self._fast_path_char_cnt, self._total_char_cnt
+        ratio = (fast / total) if total else 0
+        return self._screen.stats() + \
+                f"\nFast path: {fast} of {total} chars ({ratio:.0%})"
 
 
 class PopenSpawnExt(ReadFilter, pexpect.popen_spawn.PopenSpawn):
@@ -298,6 +464,17 @@ class PTYSpawnExt(ReadFilter, pexpect.pty_spawn.spawn):
 
 
 class PexpectMixin(object):
+    # search the prompts only in the last chars read (see -x-read-size)
+    # instead of in the whole output read so far. Runners with prompts
+    # that depend on what is before them (like a ^) should disable this.
+    _bounded_prompt_search = True
+
+    # while waiting for the prompt, check every these many seconds if
+    # the execution was cancelled (see ExampleRunner.cancellation).
+    # Runners that override _expect_and_read and cannot be called
+    # several times to wait for the same prompt should disable this.
+    _cancellation_poll_interval = 0.1
+
     def __init__(self, PS1_re, any_PS_re):
         if not isinstance(self, ExampleRunner):
             raise TypeError(
@@ -315,6 +492,11 @@ class PexpectMixin(object):
         self._last_output_may_be_incomplete = False
         self._cmd = None
 
+        self._term_feed = None
+
+        self._drain_window = self._drain_min_window
+        self._drain_stats = collections.Counter()
+
     def _set_prompts(self, PS1_re, any_PS_re):
         self._PS1_re = re.compile(PS1_re)
         self._any_PS_re = re.compile(any_PS_re)
@@ -375,6 +557,16 @@ class PexpectMixin(object):
                 v = '.'.join(map(str, v))
                 clog().info("%s's version: (%s)", repr(self), v)
 
+        # pexpect searches the prompts in all the output read so far
+        # after each read which it is quadratic for large outputs.
+        # Bound the search to the last 2*read_size chars which
+        # includes the current read always
+        read_size = options['x']['read_size']
+        if self._bounded_prompt_search:
+            searchwindowsize = 2 * read_size
+        else:
+            searchwindowsize = None
+
         spawner = PopenSpawnExt if subprocess else PTYSpawnExt
         try:
             self._interpreter = spawner(
@@ -383,7 +575,9 @@ class PexpectMixin(object):
                 encoding=self.cfg.encoding,
                 dimensions=(rows, cols),
                 codec_errors=self.cfg.enc_error_handler,
-                env=env
+                env=env,
+                maxread=read_size,
+                searchwindowsize=searchwindowsize
             )
         except Exception as err:
             if 'command was not found' in str(err):
@@ -490,6 +684,7 @@ class PexpectMixin(object):
     def _drop_output(self):
         self._output_between_prompts = []
         self._last_output_may_be_incomplete = False
+        self._term_feed = None
 
     @profile
     def _shutdown_interpreter(self):
@@ -585,38 +780,53 @@ class PexpectMixin(object):
         countdown = Countdown(timeout)
         lines = source.split('\n')
 
+        self._start_terminal_feed(options)
+        self._interpreter.limit_output(options['max_output'])
+
         if clog().isEnabledFor(DEBUG):
             with log_with("sendlines") as clog2:
                 clog2.debug("\n > " + '\n > '.join(lines))
 
+        completed = False
         try:
             self._last_num_lines_sent = 0
-            for line in lines[:-1]:
+            if self._can_sync_by_sentinel(options, input_list):
+                self._send_block_and_wait_sentinel(lines, options, countdown)
+            elif self._can_block_send(options, input_list):
+                self._send_block_and_wait(lines, options, countdown)
+            else:
+                for line in lines[:-1]:
+                    with profile_ctx("sendline"):
+                        # turn the echo off (may be)
+                        self._may_turn_echo_off(options)
+
+                        self._sendline(line)
+                        self._last_num_lines_sent += 1
+                    self._expect_prompt_or_type(
+                        options, countdown, input_list=input_list
+                    )
+
                 with profile_ctx("sendline"):
                     # turn the echo off (may be)
                     self._may_turn_echo_off(options)
 
-                    self._sendline(line)
+                    self._sendline(lines[-1])
                     self._last_num_lines_sent += 1
+
                 self._expect_prompt_or_type(
-                    options, countdown, input_list=input_list
+                    options,
+                    countdown,
+                    prompt_re=self._PS1_re,
+                    input_list=input_list
                 )
-
-            with profile_ctx("sendline"):
-                # turn the echo off (may be)
-                self._may_turn_echo_off(options)
-
-                self._sendline(lines[-1])
-                self._last_num_lines_sent += 1
-
-            self._expect_prompt_or_type(
-                options,
-                countdown,
-                prompt_re=self._PS1_re,
-                input_list=input_list
-            )
             self._expect_delayed_output(options)
+            completed = True
         finally:
+            # if completed, see _truncate_output
+            spill = self._interpreter.end_limit_output()
+            if spill and not completed:
+                self._output_exceeded(spill, options, from_example)
+
             unh = self._interpreter.were_unhandled_escape_sequences()
 
             if from_example is not None and unh:
@@ -652,10 +862,216 @@ class PexpectMixin(object):
         if clog().isEnabledFor(DEBUG):
             with log_with("raw-got") as clog2:
                 clog2.debug("\n" + ''.join(self._output_between_prompts))
+            with log_with("term") as clog2:
+                clog2.debug(f"Read filter:\n{self._interpreter.stats()}")
+            with log_with("drain") as clog2:
+                clog2.debug(f"Drain:\n{self.drain_stats()}")
 
         out = self._get_output(options)
+        if spill:
+            out = self._truncate_output(out, spill, options, from_example)
         return out
 
+    def _truncate_output(self, out, spill, options, from_example):
+        ''' Truncate the output to +max-output chars and mark it.
+
+            The limit counts the prompts too (see ReadFilter.limit_output)
+            so it may be exceeded while the output between them was not:
+            in that case the output is returned as is.
+
+            The output may have already a marker followed by its last
+            part (see ReadFilter._limit_output): only what is before
+            the marker is kept.
+            '''
+        max_output = options['max_output']
+        marker = ReadFilter._truncated_output_marker
+        head, *tail = out.split(marker.strip(), 1)
+        if not tail and len(head) <= max_output:
+            with contextlib.suppress(OSError):
+                os.remove(spill)
+            return out
+
+        self._output_exceeded(spill, options, from_example)
+        return head[:max_output].rstrip('\n') + marker.rstrip('\n')
+
+    def _output_exceeded(self, spill, options, from_example):
+        ''' Mark the example as failed because its output exceeded
+            the limit and its rest was saved in <spill>
+            (see ReadFilter.limit_output).
+            '''
+        if from_example is None:
+            with contextlib.suppress(OSError):
+                os.remove(spill)  # nobody would know about it
+            return
+
+        from_example.output_spill = spill
+        from_example.add_note_on_failure(
+            "The output exceeded +max-output=%i chars so it was truncated to that size and the example failed without checking it.\nThe output beyond the limit was saved in %s"
+            % (options['max_output'], spill)
+        )
+
+    def _can_block_send(self, options, input_list):
+        ''' Return if the source can be sent in a single write
+            (see _send_block_and_wait).
+
+            The runner must support it and the user must enable it
+            with +block-send. Examples that require typing (+type) or
+            an echo filtering fall back to the line by line mode.
+            '''
+        return (
+            self.supports_block_send and options['block_send']
+            and not input_list
+            and not self._is_echo_filtering_enforced(options)
+        )
+
+    @profile
+    def _send_block_and_wait(self, lines, options, countdown):
+        ''' Send all the <lines> in a single write and then wait
+            for one prompt per line, the last being the PS1.
+
+            The interpreter reads the lines from the terminal one by one
+            and it prints a prompt after each as if they were typed
+            so the output collected is the same than sending them one
+            by one but without waiting for each prompt before sending
+            the next line.
+            '''
+        with profile_ctx("sendline"):
+            # turn the echo off (may be)
+            self._may_turn_echo_off(options)
+
+            linesep = self._interpreter.linesep
+            self._send(linesep.join(lines) + linesep)
+            self._last_num_lines_sent = len(lines)
+
+        for _ in lines[:-1]:
+            self._expect_prompt(options, countdown)
+
+        self._expect_prompt(options, countdown, prompt_re=self._PS1_re)
+
+    def _can_sync_by_sentinel(self, options, input_list):
+        ''' Return if the end of the example can be detected with
+            a sentinel (see _send_block_and_wait_sentinel).
+
+            The runner must support it and the user must enable it
+            with +sentinel. Like in the block send mode, examples that
+            require typing (+type) or an echo filtering fall back to
+            the prompt detection.
+
+            Subclasses may extend this to disable the sentinel in other
+            cases too.
+            '''
+        return (
+            self.supports_sentinel and options['sentinel'] and not input_list
+            and not self._is_echo_filtering_enforced(options)
+        )
+
+    def _sentinel_source(self, head, tail):
+        ''' Return a line of code that makes the interpreter print
+            <head> followed by <tail> (<head><tail>) and nothing else
+            before them.
+
+            The line itself must not contain <head><tail> so an echo
+            of it will not be confused with the real sentinel
+            (for example, print them as two strings concatenated by the
+            interpreter).
+
+            Runners that set supports_sentinel must implement this.
+            '''
+        raise NotImplementedError()  # pragma: no cover
+
+    @profile
+    def _send_block_and_wait_sentinel(self, lines, options, countdown):
+        ''' Send all the <lines> followed by a line that prints
+            a random nonce (the sentinel) in a single write and wait
+            for the sentinel.
+
+            Instead of matching the prompts' regexs on each read, only
+            the sentinel, a fixed string, is searched. Once found, the
+            output is split by the prompts once to get the same chunks
+            than sending the lines one by one.
+            '''
+        with profile_ctx("sendline"):
+            # turn the echo off (may be)
+            self._may_turn_echo_off(options)
+
+            sentinel = self._send_sentinel(lines)
+            self._last_num_lines_sent = len(lines)
+
+        output = self._expect_sentinel(options, countdown, sentinel)
+
+        # the last chunk is what the interpreter printed for the
+        # sentinel's line before the sentinel (its echo if any)
+        chunks = self._split_by_prompts(output)[:-1]
+        for chunk in chunks:
+            self._add_output(chunk)
+            self._last_output_may_be_incomplete = False
+
+    def _send_sentinel(self, lines=()):
+        ''' Send the <lines> (if any) followed by the sentinel's line
+            in a single write and return the sentinel to wait for.
+            '''
+        head, tail = '/byexample/sentinel/', secrets.token_hex(8)
+        lines = list(lines) + [self._sentinel_source(head, tail)]
+
+        linesep = self._interpreter.linesep
+        self._send(linesep.join(lines) + linesep)
+        return head + tail
+
+    @profile
+    def _expect_sentinel(self, options, countdown, sentinel):
+        ''' Wait for the <sentinel> and the PS1 prompt that follows
+            it and return the output read before the sentinel.
+
+            Anything printed between the sentinel and the PS1 (like
+            the rest of the sentinel's line) is discarded.
+
+            Raise a timeout if they are not found in time.
+            '''
+        expect = [sentinel, pexpect.TIMEOUT, pexpect.EOF]
+        Found, Timeout, EOF = range(len(expect))
+
+        timeout = countdown.left()
+        countdown.start()
+        what = self._interpreter.expect_exact(expect, timeout=timeout)
+        countdown.stop()
+
+        output = self._interpreter.before
+        if what == Found:
+            expect[Found] = self._PS1_re
+
+            timeout = countdown.left()
+            countdown.start()
+            what = self._interpreter.expect(expect, timeout=timeout)
+            countdown.stop()
+        else:
+            self._add_output(output)
+
+        if what == Timeout:
+            msg = "Sentinel or prompt not found: the code is taking too long to finish or there is a syntax error.\n\nLast 1000 bytes read:\n%s"
+            raw_output = ''.join(self._output_between_prompts)
+            msg = msg % raw_output[-1000:]
+            out = self._get_output(options)
+            raise TimeoutException(msg, out, raw_output)
+
+        elif what == EOF:
+            self._interpreter_closed_unexpectedly_error(options)
+
+        assert what == Found
+        return output
+
+    def _split_by_prompts(self, output):
+        ''' Split the <output> by the prompts (any self._any_PS_re)
+            returning the chunks between them.
+            '''
+        chunks = []
+        begin = 0
+        for m in self._any_PS_re.finditer(output):
+            chunks.append(output[begin:m.start()])
+            begin = m.end()
+
+        chunks.append(output[begin:])
+        return chunks
+
     @profile
     def _expect_delayed_output(self, options):
         ''' Some interpreters may output text *after* printing the prompt.
@@ -749,7 +1165,6 @@ class PexpectMixin(object):
         r''' Map \r and \n to \r\n '''
         return PexpectMixin.LF_or_CR_REGEX.sub('\r\n', out)
 
-    @log_context('byexample.exec.term')
     def _pass_output_chunks_through_ansi_terminal(
         self, chunks, join=True, terminal_geometry=None
     ):
@@ -761,6 +1176,16 @@ class PexpectMixin(object):
         for chunk in chunks:
             self._stream.feed(chunk)
 
+        lines = self._read_ansi_terminal()
+
+        if terminal_geometry:
+            self._screen.resize(*old_geometry)
+
+        return '\n'.join(lines) if join else lines
+
+    @log_context('byexample.exec.term')
+    def _read_ansi_terminal(self):
+        ''' Return the lines displayed by the terminal and reset it. '''
         lines = self._screen.compressed_display(bfilter=True, rstrip=True)
 
         if clog().isEnabledFor(DEBUG):
@@ -772,14 +1197,10 @@ class PexpectMixin(object):
             clog().debug(f"ANSI terminal screen {g[0]}x{g[1]}:\n{r}")
 
         self._screen.reset()
-        if terminal_geometry:
-            self._screen.resize(*old_geometry)
 
         # ensure the lines are right-stripped, termscraper (compressed_display)
         # may not fully do this.
-        lines = (line.rstrip() for line in lines)
-
-        return '\n'.join(lines) if join else lines
+        return (line.rstrip() for line in lines)
 
     def _emulate_dumb_terminal(self, chunks, options):
         # If the echo filtering is on, this will imply a terminal
@@ -806,6 +1227,13 @@ class PexpectMixin(object):
         return ''.join(chunks)
 
     def _emulate_ansi_terminal(self, chunks, options):
+        # The chunks may had been already fed to the terminal while
+        # they were read, without their echos (see _start_terminal_feed)
+        fed = self._was_terminal_fed_with(chunks)
+        self._term_feed = None
+        if fed:
+            return '\n'.join(self._read_ansi_terminal())
+
         # Do a first pass doing a terminal emulation and filtering the echos
         # using an "unbound" (very large) geometry
         if self._is_echo_filtering_enforced(options):
@@ -863,8 +1291,8 @@ class PexpectMixin(object):
             # echo-emulation (TODO: some interpreters have echo activated,
             # should this be necessary?)
             chunk = "{}[{}]\r\n".format(self._interpreter.match.group(), input)
-            self._output_between_prompts[-1] += chunk
             assert self._last_output_may_be_incomplete
+            self._add_output(chunk)
 
             self._sendline(input)
             self._last_num_lines_sent += 1
@@ -918,8 +1346,12 @@ class PexpectMixin(object):
         expect_kinds = (PS_found, Timeout, EOF, Earlier)
 
         countdown.start()
-        what, output = self._expect_and_read(expect, timeout, expect_kinds)
-        countdown.stop()
+        try:
+            what, output = self._expect_and_read_or_cancel(
+                expect, timeout, expect_kinds
+            )
+        finally:
+            countdown.stop()
 
         self._add_output(output)
 
@@ -941,6 +1373,32 @@ class PexpectMixin(object):
         self._last_output_may_be_incomplete = False
         return True
 
+    def _expect_and_read_or_cancel(self, expect_list, timeout, expect_kinds):
+        ''' Like _expect_and_read but if the execution can be cancelled,
+            wait in slices of _cancellation_poll_interval seconds
+            and raise ExecutionCancelled if it was cancelled.
+
+            Pexpect keeps what it read if the expect times out so the
+            next slice continues from there.
+            '''
+        cancellation = self.cancellation
+        poll = self._cancellation_poll_interval
+        if cancellation is None or not poll or timeout <= poll:
+            return self._expect_and_read(expect_list, timeout, expect_kinds)
+
+        Timeout = expect_kinds[1]
+        deadline = time.monotonic() + timeout
+        while True:
+            if cancellation.is_set():
+                raise ExecutionCancelled("Another job failed.")
+
+            left = max(deadline - time.monotonic(), 0)
+            what, output = self._expect_and_read(
+                expect_list, min(left, poll), expect_kinds
+            )
+            if what != Timeout or left <= poll:
+                return what, output
+
     def _interpreter_closed_unexpectedly_error(self, options):
         msg = "Interpreter closed unexpectedly.\nThis could happen because the example triggered a close/shutdown/exit action,\nthe interpreter was killed by someone else or because the interpreter just crashed.\n\nLast 1000 bytes read:\n%s"
         raw_output = ''.join(self._output_between_prompts)
@@ -956,11 +1414,77 @@ class PexpectMixin(object):
             of it (like part of the same line).
 
             Otherwise assume that it is a new chunk/line.
+
+            If the output is being fed to a terminal (see
+            _start_terminal_feed), feed it now.
             '''
-        if self._last_output_may_be_incomplete:
-            self._output_between_prompts[-1] += output
-        else:
+        new_chunk = not self._last_output_may_be_incomplete
+        if new_chunk:
             self._output_between_prompts.append(output)
+        else:
+            self._output_between_prompts[-1] += output
+
+        if self._term_feed is not None:
+            self._feed_terminal(output, new_chunk)
+
+    def _start_terminal_feed(self, options):
+        ''' Emulate the output in the example's terminal while it is
+            being read (see _add_output) instead of replaying all of it
+            later in _get_output so each byte goes through the terminal
+            only once.
+
+            This is done only for +term=ansi. With echo filtering the
+            echo is removed before feeding the terminal so the first
+            pass of _filter_echo_by_tagging is not needed.
+            '''
+        self._term_feed = None
+        if options['term'] != 'ansi' or self._output_between_prompts:
+            return
+
+        self._screen.reset()
+        self._term_fed = 0
+        self._term_echo = False if self._is_echo_filtering_enforced(
+            options
+        ) else None
+        self._term_feed = self._output_between_prompts
+
+    def _feed_terminal(self, output, new_chunk):
+        ''' Feed the given output to the example's terminal.
+
+            With echo filtering, each new chunk begins with the echo
+            of the line typed: drop it up to and including its first
+            linefeed. The line break is kept if the previous chunk
+            did not end with one, like the prompt would do.
+            '''
+        self._term_fed += len(output)
+        if new_chunk and self._term_echo is not None:
+            self._term_echo = True
+
+        if self._term_echo:
+            eol = output.find('\n')
+            if eol < 0:
+                return
+
+            output = output[eol + 1:]
+            self._term_echo = False
+            if self._screen.cursor_x > 0:
+                output = '\r\n' + output
+
+        self._stream.feed(output)
+
+    def _was_terminal_fed_with(self, chunks):
+        ''' Return if the given chunks are the ones that were fed to the
+            terminal (see _start_terminal_feed).
+
+            Runners that rebuild the output between prompts before
+            emulating it (see _get_output) get a replay instead.
+            '''
+        if self._term_feed is None:
+            return False
+
+        return chunks is self._term_feed and self._term_fed == sum(
+            len(c) for c in chunks
+        )
 
     @profile
     def _expect_and_read(self, expect_list, timeout, expect_kinds):
@@ -980,41 +1504,71 @@ class PexpectMixin(object):
         what = self._interpreter.expect(expect_list, timeout=timeout)
         return what, self._interpreter.before
 
+    # bounds of the quiescence window of _drain (in seconds)
+    _drain_min_window = 0.0005
+    _drain_max_window = 0.05
+
     @profile
     def _drain(self, options):
         ''' Read and discard output as much as possible from the interpreter
             effectively draining its buffers.
+
+            The drain ends when the interpreter does not write anything
+            for a window of time (quiescence window). The window is
+            adapted after each drain: if the output arrived with some
+            delay, the next drains will wait longer, otherwise
+            the window shrinks back to its minimum.
         '''
-        # time cost: drain_timeout + delaybeforedrain
-        drain_timeout = 0.001
-        delaybeforedrain = 0
         drain_sz = 1024**2
+        window = self._drain_window
 
-        assert drain_timeout > 0
-
-        # wait a moment so the interpreter has a change to write in
-        # its buffer (if it wants to)
-        if delaybeforedrain:
-            time.sleep(delaybeforedrain)
-
-        # loop reading as much as possible and break when no data is available
-        # after a while (on timeout).
         # if for some reason the interpreter is still giving a little of data
         # on each round but it never stops, eventually give up with a warning
-        drain_countdown = Countdown(drain_timeout)
-        still_writing = True
-        while not drain_countdown.did_run_out():
-            try:
-                left = max(drain_countdown.left(), 0.0001)
-                drain_countdown.start()
-                self._interpreter.read_nonblocking(size=drain_sz, timeout=left)
+        begin = last = time.monotonic()
+        deadline = begin + 20 * window
+
+        # wait for the output (read_nonblocking waits for the
+        # interpreter's fd to be readable) and break when no data
+        # is available after the window
+        still_writing = False
+        max_gap = 0
+        stats = self._drain_stats
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
                 still_writing = True
+                break
+
+            try:
+                data = self._interpreter.read_nonblocking(
+                    size=drain_sz, timeout=min(window, deadline - now)
+                )
             except pexpect.EOF:
                 self._interpreter_closed_unexpectedly_error(options)
             except pexpect.TIMEOUT:
-                still_writing = False
-            finally:
-                drain_countdown.stop()
+                break
+
+            now = time.monotonic()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+            stats['reads'] += 1
+            stats['bytes'] += len(data)
+
+        stats['drains'] += 1
+        stats['time'] += time.monotonic() - begin
+        if max_gap > 0:
+            stats['with_output'] += 1
+
+        # learn from how late the output arrived: wait twice the
+        # largest gap seen the next time
+        target = min(
+            max(2 * max_gap, self._drain_min_window), self._drain_max_window
+        )
+        if target > window:
+            self._drain_window = target
+        else:
+            self._drain_window = (3 * window + target) / 4
 
         if still_writing:
             clog().warn(
@@ -1032,6 +1586,18 @@ class PexpectMixin(object):
         self._interpreter._buffer.truncate(0)
         self._interpreter._before.truncate(0)
 
+    def drain_stats(self):
+        ''' Return a summary of the drains done so far (see _drain). '''
+        st = self._drain_stats
+        drains = st['drains']
+        avg = (st['time'] / drains) if drains else 0
+        return (
+            f"Drains: {drains} ({st['with_output']} with output), "
+            f"{st['reads']} reads, {st['bytes']} bytes\n"
+            f"Time: {st['time'] * 1000:.2f} ms (avg {avg * 1000:.3f} ms), "
+            f"window {self._drain_window * 1000:.3f} ms"
+        )
+
     @profile
     def _get_output(self, options):
         if options['term'] == 'dumb':
@@ -1186,6 +1752,16 @@ class PexpectMixin(object):
         self._sendcontrol('c')
         return self._recover_prompt_sync(example, options)
 
+    def _can_recover_by_sentinel(self, options):
+        ''' Return if _recover_prompt_sync can resynchronize with the
+            interpreter sending a sentinel (see _send_sentinel).
+
+            Unlike _can_sync_by_sentinel, this does not depend on
+            +sentinel nor on the echo filtering: the output read during
+            the recovery is discarded anyways.
+            '''
+        return self.supports_sentinel
+
     def _recover_prompt_sync(self, example, options, cnt=5):
         ''' Expect for at least one prompt, return False if we
             didn't find one in a reasonable time (dfl_timeout).
@@ -1203,8 +1779,46 @@ class PexpectMixin(object):
             less than <cnt> prompts (so we are at the 'end').
 
             This algorithm is not bug-free, just a best-effort one.
+
+            If the runner supports a sentinel, send one and wait for it
+            instead (see _can_recover_by_sentinel).
             '''
         err_msg = "Interpreter closed unexpectedly during the recovering. May be it is timming issue. Try to increase the timeout for the example."
+        if self._can_recover_by_sentinel(options):
+            # any output or prompt pending before the sentinel is
+            # discarded so once it is found we are in sync: no need
+            # to count the spurious prompts.
+            # The interpreter may discard the sentinel if it was
+            # typed before it handled the interruption (readline does
+            # this) so a new sentinel is sent, waiting each time
+            # the double, up to dfl_timeout.
+            # Because the interpreter runs them in order, once the
+            # last one is found, the previous ones are behind us.
+            countdown = Countdown(options['x']['dfl_timeout'])
+            wait = 0.1
+            good = False
+            try:
+                while not good and not countdown.did_run_out():
+                    sentinel = self._send_sentinel()
+                    probe = Countdown(min(wait, countdown.left()))
+                    wait *= 2
+
+                    countdown.start()
+                    try:
+                        self._expect_sentinel(options, probe, sentinel)
+                        good = True
+                    except TimeoutException as ex:
+                        pass
+                    finally:
+                        countdown.stop()
+                        self._drop_output()
+            except InterpreterClosedUnexpectedly:
+                clog().warn(err_msg)
+                good = False
+
+            self._drop_output()
+            return good
+
         try:
             # wait for the prompt, ignore any extra output
             self._expect_prompt(
@@ -0,0 +1,116 @@
+from __future__ import unicode_literals
+import os, time
+
+
+class FileWatcher(object):
+    r'''
+    Watch the given <files> and the python modules in the given <dirs>
+    checking their status (modification time, size and inode) every
+    <interval> seconds (see --watch).
+
+        >>> import tempfile, os
+        >>> from byexample.watch import FileWatcher
+
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> test = os.path.join(tmpdir.name, 'test.md')
+        >>> with open(test, 'wt') as f:
+        ...     _ = f.write('first version')
+
+        >>> watcher = FileWatcher([test], [tmpdir.name])
+
+    ``poll`` returns the files that changed since the last call:
+
+        >>> watcher.poll()
+        []
+
+        >>> with open(test, 'wt') as f:
+        ...     _ = f.write('second and longer version')
+
+        >>> watcher.poll() == [test]
+        True
+        >>> watcher.poll()
+        []
+
+    A change in a module does not trigger the run of any file but
+    it is flagged in ``modules_changed``:
+
+        >>> watcher.modules_changed
+        False
+
+        >>> with open(os.path.join(tmpdir.name, 'foo.py'), 'wt') as f:
+        ...     _ = f.write('foo = 1')
+
+        >>> watcher.poll()
+        []
+        >>> watcher.modules_changed
+        True
+
+        >>> tmpdir.cleanup()
+    '''
+    def __init__(self, files, dirs, interval=0.5, settle=0.1):
+        self.files = list(files)
+        self.dirs = list(dirs)
+
+        self.interval = interval
+        self.settle = settle
+
+        self.modules_changed = False
+        self.files_state = self._stat_files()
+        self.dirs_state = self._stat_dirs()
+
+    def wait_for_changes(self):
+        ''' Block until at least one of the files or a module changes
+            and return the files that changed (if any).
+            '''
+        while True:
+            time.sleep(self.interval)
+            changed = self.poll()
+            if not (changed or self.modules_changed):
+                continue
+
+            # the editors may save a file in several steps (write to a
+            # temporal file and then rename it): wait for them to finish
+            time.sleep(self.settle)
+            more = self.poll()
+            return changed + [f for f in more if f not in changed]
+
+    def poll(self):
+        ''' Return the files that changed since the last poll.
+
+            A file that was removed is not returned but if it is
+            created again, it is.
+            '''
+        files, dirs = self._stat_files(), self._stat_dirs()
+
+        changed = [
+            f for f in self.files
+            if files[f] != self.files_state[f] and files[f] is not None
+        ]
+        self.modules_changed = self.modules_changed or dirs != self.dirs_state
+
+        self.files_state, self.dirs_state = files, dirs
+        return changed
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _stat_files(self):
+        return {f: self._stat(f) for f in self.files}
+
+    def _stat_dirs(self):
+        state = {}
+        for dirname in self.dirs:
+            for root, subdirs, fnames in os.walk(dirname):
+                subdirs[:] = [d for d in subdirs if d != '__pycache__']
+                for fname in fnames:
+                    if fname.endswith('.py'):
+                        path = os.path.join(root, fname)
+                        state[path] = self._stat(path)
+
+        return state
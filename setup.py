@@ -125,6 +125,9 @@ setup(
         'console_scripts': [
             'byexample = byexample.byexample:main',
             ],
+        'pytest11': [
+            'byexample = byexample.pytest_plugin',
+            ],
         }
 )
 
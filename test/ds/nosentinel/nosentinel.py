@@ -0,0 +1,11 @@
+from byexample.concern import Concern
+
+
+class NoSentinelRecovery(Concern):
+    ''' Make the runners to recover the control of the interpreter
+        without a sentinel, like the runners that do not support one
+        (see PexpectMixin._recover_prompt_sync). '''
+    target = 'no-sentinel-recovery'
+
+    def start_example(self, example, options):
+        example.runner.supports_sentinel = False